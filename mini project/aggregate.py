@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------------
+# 单次聚合：直接在 JHU 宽表上按国家求和（~290 行），三个指标按索引对齐后只做一次 melt
+# 代替 melt -> 三次 groupby(['Country/Region', 'Date']) -> 两次 outer merge
+# -----------------------------------
+ID_VARS = ["Province/State", "Country/Region", "Lat", "Long"]
+DATE_FORMAT = "%m/%d/%y"
+
+
+def sum_by_country(df_wide):
+    date_columns = [c for c in df_wide.columns if c not in ID_VARS]
+    return df_wide.groupby("Country/Region")[date_columns].sum()
+
+
+def diff_by_date(frame):
+    # 等价于 frame.diff(axis=1)，但直接在 ndarray 上计算，避免逐列插入
+    values = frame.to_numpy(dtype=float)
+    new_values = np.full_like(values, np.nan)
+    new_values[:, 1:] = np.diff(values, axis=1)
+    return pd.DataFrame(new_values, index=frame.index, columns=frame.columns)
+
+
+def wide_to_long(frames):
+    # frames: {列名: 国家 x 日期列 的宽表}，按国家和日期外连接对齐后一次性转成长表，
+    # 结果按 Country/Region、Date 排序
+    countries = pd.Index([])
+    labels = pd.Index([])
+    for frame in frames.values():
+        countries = countries.union(frame.index)
+        labels = labels.union(frame.columns, sort=False)
+
+    # 每个日期标签只解析一次
+    dates = pd.to_datetime(labels, format=DATE_FORMAT)
+    order = np.argsort(dates.values, kind="stable")
+    labels, dates = labels[order], dates[order]
+
+    data = {
+        "Country/Region": np.repeat(countries.to_numpy(), len(dates)),
+        "Date": np.tile(dates.values, len(countries)),
+    }
+    for name, frame in frames.items():
+        data[name] = frame.reindex(index=countries, columns=labels).to_numpy().ravel()
+    return pd.DataFrame(data)
+
+
+def aggregate_global(df_confirmed, df_deaths, df_recovered, with_new=False):
+    frames = {
+        "Confirmed": sum_by_country(df_confirmed),
+        "Deaths": sum_by_country(df_deaths),
+        "Recovered": sum_by_country(df_recovered),
+    }
+    if with_new:
+        countries = frames["Confirmed"].index.union(frames["Deaths"].index).union(frames["Recovered"].index)
+        for metric in list(frames):
+            # 沿日期方向 diff，第一天和缺失值处的新增记为 0
+            frames[f"New_{metric}"] = diff_by_date(frames[metric].reindex(countries)).fillna(0)
+    return wide_to_long(frames)
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aggregate import aggregate_global, ID_VARS
+
+# -----------------------------------
+# 对比旧流程（melt -> 三次 groupby -> 两次 outer merge）与 aggregate_global 的耗时
+# 两者输出一致由 tests/test_aggregate.py 检查。在 "mini project" 目录下运行：
+#   python benchmarks/bench_aggregate.py [重复次数]
+# -----------------------------------
+data_folder = 'dataset'
+
+
+def legacy_aggregate(df_confirmed, df_deaths, df_recovered):
+    def melt(df, value_name):
+        df_long = df.melt(id_vars=ID_VARS, var_name="Date", value_name=value_name)
+        df_long["Date"] = pd.to_datetime(df_long["Date"], format="%m/%d/%y")
+        return df_long
+
+    confirmed = melt(df_confirmed, 'Confirmed')
+    deaths = melt(df_deaths, 'Deaths')
+    recovered = melt(df_recovered, 'Recovered')
+
+    confirmed_grouped = confirmed.groupby(['Country/Region', 'Date'])['Confirmed'].sum().reset_index()
+    deaths_grouped = deaths.groupby(['Country/Region', 'Date'])['Deaths'].sum().reset_index()
+    recovered_grouped = recovered.groupby(['Country/Region', 'Date'])['Recovered'].sum().reset_index()
+
+    df_global = pd.merge(confirmed_grouped, deaths_grouped, on=['Country/Region', 'Date'], how='outer')
+    df_global = pd.merge(df_global, recovered_grouped, on=['Country/Region', 'Date'], how='outer')
+    return df_global
+
+
+def best_of(func, args, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    frames = [
+        pd.read_csv(os.path.join(data_folder, 'time_series_covid19_confirmed_global.csv')),
+        pd.read_csv(os.path.join(data_folder, 'time_series_covid19_deaths_global.csv')),
+        pd.read_csv(os.path.join(data_folder, 'time_series_covid19_recovered_global.csv')),
+    ]
+
+    legacy_time, expected = best_of(legacy_aggregate, frames, repeat)
+    fused_time, result = best_of(aggregate_global, frames, repeat)
+
+    print(f"{len(result)} 行")
+    print(f"旧流程 (melt + groupby + merge): {legacy_time * 1000:8.1f} ms")
+    print(f"aggregate_global:                {fused_time * 1000:8.1f} ms")
+    print(f"加速比: {legacy_time / fused_time:.1f}x")
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from covid_data import load_global
+from cube import build_cube, METRICS, NEW_METRICS
+
+# -----------------------------------
+# 回调取数：旧的按国家过滤长表 vs cube 上按国家取视图
+# 分别选 1、10 和全部国家，先检查两者结果一致，再比较耗时。在 "mini project" 目录下运行：
+#   python benchmarks/bench_callbacks.py [重复次数]
+# -----------------------------------
+
+
+def legacy_global_series(df_grouped, countries, start_date, end_date):
+    # 旧 update_global_graphs：先按日期和国家过滤，再在两张图里对每个国家各过滤一次
+    mask = (
+        (df_grouped["Date"] >= start_date) &
+        (df_grouped["Date"] <= end_date) &
+        (df_grouped["Country/Region"].isin(countries))
+    )
+    filtered = df_grouped[mask]
+    result = []
+    for country in countries:
+        country_data = filtered[filtered["Country/Region"] == country]
+        data = {metric: country_data[metric].to_numpy() for metric in METRICS}
+        country_data = filtered[filtered["Country/Region"] == country]
+        data.update({metric: country_data[metric].to_numpy() for metric in NEW_METRICS})
+        result.append(data)
+    return result
+
+
+def index_global_series(cube, countries, start_date, end_date):
+    days = cube.day_slice(start_date, end_date)
+    return [cube.series(country, days) for country in countries]
+
+
+def legacy_daily_info(df_grouped, countries, latest_date):
+    one_month_ago = latest_date - pd.Timedelta(days=30)
+    df_last_month = df_grouped[df_grouped["Date"] >= one_month_ago]
+    return df_last_month[df_last_month["Country/Region"].isin(countries)]
+
+
+def index_daily_info(cube, countries, latest_date):
+    one_month_ago = latest_date - pd.Timedelta(days=30)
+    return cube.frame(countries=countries, days=cube.day_slice(one_month_ago, None))
+
+
+def best_of(func, args, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    df_grouped = load_global()
+    cube = build_cube(df_grouped)
+    start_date, end_date = cube.start_date, cube.end_date
+    all_countries = cube.countries
+    selections = {
+        "1": ["US"] if "US" in cube.country_index else all_countries[:1],
+        "10": all_countries[::max(len(all_countries) // 10, 1)][:10],
+        f"all ({len(all_countries)})": all_countries,
+    }
+
+    print(f"{'countries':>12} {'callback':>12} {'legacy ms':>10} {'index ms':>10} {'speedup':>8}")
+    for label, countries in selections.items():
+        legacy_time, expected = best_of(legacy_global_series, (df_grouped, countries, start_date, end_date), repeat)
+        index_time, result = best_of(index_global_series, (cube, countries, start_date, end_date), repeat)
+        for old, new in zip(expected, result):
+            for metric in METRICS + NEW_METRICS:
+                np.testing.assert_array_equal(old[metric], new[metric])
+        print(f"{label:>12} {'global':>12} {legacy_time * 1000:10.2f} {index_time * 1000:10.2f} {legacy_time / index_time:7.0f}x")
+
+        legacy_time, expected = best_of(legacy_daily_info, (df_grouped, countries, end_date), repeat)
+        index_time, result = best_of(index_daily_info, (cube, countries, end_date), repeat)
+        expected = expected.astype({"Country/Region": object}).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+        print(f"{label:>12} {'daily info':>12} {legacy_time * 1000:10.2f} {index_time * 1000:10.2f} {legacy_time / index_time:7.0f}x")
@@ -0,0 +1,73 @@
+import base64
+import gzip
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATA_RELOAD_INTERVAL", "0")
+from dash_app import snapshot
+from page_global import build_global_figures
+from heatmap import heatmap_figure, animated_heatmap_figure
+
+# -----------------------------------
+# 图表传输格式对比：旧的 JSON 数字列表 + ISO 日期字符串 vs base64 类型数组 + epoch 毫秒
+# 对每个回调的图表比较序列化耗时（Dash 用的 to_json_plotly）、原始大小和 gzip 后大小。
+# 在 "mini project" 目录下运行：
+#   python benchmarks/bench_figure_payload.py [重复次数]
+# -----------------------------------
+
+
+def to_plain(value, date_axis=False):
+    # 把类型数组还原成 JSON 列表；date_axis 时 x 还原成 ISO 日期字符串（旧格式）
+    if isinstance(value, dict):
+        if "bdata" in value:
+            array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=np.dtype(value["dtype"]))
+            if "shape" in value:
+                array = array.reshape([int(n) for n in str(value["shape"]).split(",")])
+            return array.tolist()
+        result = {}
+        for key, item in value.items():
+            item = to_plain(item, date_axis)
+            if date_axis and key == "x" and isinstance(item, list):
+                item = pd.to_datetime(item, unit="ms").strftime("%Y-%m-%dT%H:%M:%S.%f").tolist()
+            result[key] = item
+        return result
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item, date_axis) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def measure(figure, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = to_json_plotly(figure)
+        timings.append(time.perf_counter() - start)
+    raw = body.encode()
+    return min(timings), len(raw), len(gzip.compress(raw, 6))
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    version, cube = snapshot()
+    countries = cube.countries
+    cases = {
+        "global, 1 country": (build_global_figures(cube, countries[:1], None, None, 300), True),
+        "global, 10 countries": (build_global_figures(cube, countries[::20][:10], None, None, 300), True),
+        f"global, all {len(countries)}": (build_global_figures(cube, countries, None, None, 300), True),
+        "heatmap latest": (heatmap_figure(cube.latest_frame()).to_dict(), False),
+        "heatmap animated": (animated_heatmap_figure(cube.frame()).to_dict(), False),
+    }
+
+    print(f"{'figure':>22} {'format':>7} {'ms':>8} {'raw KB':>9} {'gzip KB':>9}")
+    for label, (typed, date_axis) in cases.items():
+        plain = to_plain(typed, date_axis)
+        for name, figure in (("json", plain), ("typed", typed)):
+            elapsed, raw, packed = measure(figure, repeat)
+            print(f"{label:>22} {name:>7} {elapsed * 1000:8.1f} {raw / 1024:9.1f} {packed / 1024:9.1f}")
@@ -0,0 +1,80 @@
+import argparse
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT = os.path.dirname(HERE)
+
+# -----------------------------------
+# app 模块的导入耗时检查（python -X importtime）
+# 导入 global_covid_dashboard 时不应该加载数据或导入只在回调里用到的重模块；
+# 总耗时超过预算，或者导入了 LAZY_MODULES 中的模块时以非零状态退出。
+# 预算按 CI 机器留有余量，dash 本身（~1 s）和 pandas（~0.5 s）占了大部分。
+# 延迟导入在 pytest 中也由 tests/test_import_time.py 检查；耗时预算只在这里检查（结果受机器负载影响）。
+# 在 "mini project" 目录下运行：
+#   python benchmarks/check_import_time.py [--budget-ms 3000] [--top 15]
+# -----------------------------------
+MODULE = "global_covid_dashboard"
+BUDGET_MS = 3000
+# 这些模块只能在第一次用到时导入（见 dash_app.py 和 page_*.py）；
+# requests 和 pyarrow 已经被 dash、pandas 导入，所以检查的是本项目里用到它们的模块
+LAZY_MODULES = (
+    "plotly.express",      # heatmap、Daily Info 的摘要图
+    "disease_client",      # Daily Info 的实时数据
+    "disease_stream",
+    "covid_data",          # 数据集的加载和聚合
+    "dataset_manager",     # 共享数据集的映射和热更新线程
+)
+
+
+def import_profile(module):
+    # 返回 [(模块名, self 微秒, cumulative 微秒, 层级)]，顺序与 -X importtime 的输出相同
+    env = dict(os.environ, DATA_RELOAD_INTERVAL="0")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"import {module} failed")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the dashboard app")
+    parser.add_argument("--module", default=MODULE)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest direct imports to show")
+    args = parser.parse_args()
+
+    rows = import_profile(args.module)
+    total_ms = sum(row[1] for row in rows) / 1000
+    # 输出是后序的：模块自身那一行之前、上一个顶层模块之后的第 1 层就是它直接导入的模块
+    position = max(i for i, row in enumerate(rows) if row[0] == args.module and row[3] == 0)
+    first = max([i + 1 for i, row in enumerate(rows[:position]) if row[3] == 0] or [0])
+    direct = [row for row in rows[first:position] if row[3] == 1]
+    print(f"{'imported by ' + args.module:<40} {'cumulative ms':>14}")
+    for name, _, cumulative_us, _ in sorted(direct, key=lambda row: -row[2])[:args.top]:
+        print(f"{name:<40} {cumulative_us / 1000:14.1f}")
+    print(f"{'total':<40} {total_ms:14.1f}  (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    imported = {row[0] for row in rows}
+    for module in LAZY_MODULES:
+        if module in imported:
+            failures.append(f"{module} is imported eagerly")
+    if total_ms > args.budget_ms:
+        failures.append(f"import takes {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
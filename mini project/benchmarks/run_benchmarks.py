@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT = os.path.dirname(HERE)
+sys.path.insert(0, PROJECT)
+sys.path.insert(0, HERE)
+from synthetic import FILES, write_synthetic
+
+# -----------------------------------
+# 数据流水线和 Dash 回调的基准测试
+# 对 1x / 10x / 100x 规模的合成 JHU 数据（见 synthetic.py），逐个阶段计时（取多次中的最小值）
+# 并用 tracemalloc 记录峰值内存；app 模块的冷启动和热启动在子进程里测量（耗时 + 最大 RSS）。
+# 结果保存为 JSON，--compare 与之前保存的结果比较，变慢或内存增加超过容差时以非零状态退出。
+# 在 "mini project" 目录下运行：
+#   python benchmarks/run_benchmarks.py --scales 1,10 --save benchmarks/results/baseline.json
+#   python benchmarks/run_benchmarks.py --scales 1,10 --compare benchmarks/results/baseline.json
+# -----------------------------------
+MIN_SECONDS = 0.02  # 比这更短的差异只看比例容易误报
+MIN_PEAK_MB = 1.0
+
+
+def measure(func, repeat):
+    # 返回 ({"seconds", "peak_mb"}, 最后一次的结果)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 2 ** 20}, result
+
+
+def run_stages(repeat):
+    # 在合成数据目录（当前工作目录）下运行，返回 {阶段: {"seconds", "peak_mb"}}
+    from aggregate import aggregate_global
+    from covid_data import prepare_global
+    from cube import build_cube
+    from data_parse import load_and_melt
+    from shared_data import attach, publish
+    from storage import load_table, save_table
+
+    results = {}
+    folder = "dataset"
+    paths = [os.path.join(folder, filename) for filename in FILES.values()]
+
+    results["read_csv"], frames = measure(lambda: [pd.read_csv(path) for path in paths], repeat)
+    results["load_and_melt"], _ = measure(lambda: load_and_melt(FILES["Confirmed"], "Confirmed"), repeat)
+    results["aggregate_global"], df_global = measure(lambda: aggregate_global(*frames, with_new=True), repeat)
+    results["save_table"], _ = measure(lambda: save_table(df_global, "bench_global", folder), repeat)
+    results["load_table"], df_loaded = measure(lambda: load_table("bench_global", folder), repeat)
+    results["prepare_global"], _ = measure(lambda: prepare_global(df_loaded[["Country/Region", "Date", "Confirmed", "Deaths", "Recovered"]]), repeat)
+    results["build_cube"], cube = measure(lambda: build_cube(df_loaded), repeat)
+    shared = os.path.join(folder, "bench_shared")
+    results["publish_shared"], _ = measure(lambda: publish(cube, "bench", shared), repeat)
+    results["attach_shared"], _ = measure(lambda: attach(shared), repeat)
+    return results
+
+
+def run_callbacks(repeat):
+    import plotly.io as pio
+    import page_daily_info
+    import page_global
+    import page_leaderboard
+    from dash_app import snapshot
+    from heatmap import animated_heatmap_figure, heatmap_figure
+
+    version, cube = snapshot()
+    countries = cube.countries
+    selections = {"1": countries[:1], "10": countries[::max(len(countries) // 10, 1)][:10], "all": countries}
+
+    def global_graphs(selected):
+        # 每次清空图表缓存，测量真正的构建
+        page_global.figure_cache.clear()
+        # 回调本身只从 callback_context 取 triggered_id，其余都在 global_graphs 里
+        return page_global.global_graphs("country-dropdown", selected, None, None, None, None, "server", 1200)
+
+    results = {}
+    for label, selected in selections.items():
+        results[f"update_global_graphs[{label}]"], _ = measure(lambda: global_graphs(selected), repeat)
+    results["update_daily_info[all, 30d]"], _ = measure(lambda: page_daily_info.update_daily_info(
+        None, cube.end_date - pd.Timedelta(days=30), cube.end_date, 0, 10,
+        [{"column_id": "Confirmed", "direction": "desc"}], "", version
+    ), repeat)
+    results["update_leaderboard[top 10]"], _ = measure(lambda: page_leaderboard.update_leaderboard(
+        len(cube.dates) // 2, "New_Confirmed_7d", 10, countries[0], version
+    ), repeat)
+    results["refresh_global_controls"], _ = measure(
+        lambda: page_global.refresh_global_controls(0, None, None, None), repeat)
+    results["heatmap[latest]"], _ = measure(
+        lambda: pio.to_json(heatmap_figure(cube.latest_frame()), validate=False), repeat)
+    results["heatmap[animated]"], _ = measure(
+        lambda: pio.to_json(animated_heatmap_figure(cube.frame()), validate=False), repeat)
+    return results
+
+
+def worker(repeat):
+    results = run_stages(repeat)
+    results.update(run_callbacks(repeat))
+    print(json.dumps(results))
+
+
+# 子进程导入 app 模块并取一次数据集（数据集在第一次用到时才加载），输出耗时和最大 RSS（Windows 上没有 resource，只记录耗时）
+START_APP = """
+import json, time
+start = time.perf_counter()
+import global_covid_dashboard
+from dash_app import snapshot
+snapshot()
+seconds = time.perf_counter() - start
+try:
+    import resource
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    peak_mb = 0
+print(json.dumps({"seconds": seconds, "peak_mb": peak_mb}))
+"""
+
+
+def start_app(root, env):
+    output = subprocess.run([sys.executable, "-c", START_APP], cwd=root, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_scale(scale, workdir, repeat):
+    root = os.path.join(workdir, f"scale_{scale}")
+    print(f"[{scale}x] preparing synthetic data in {root}", file=sys.stderr)
+    write_synthetic(root, scale)
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([PROJECT, os.environ.get("PYTHONPATH", "")]),
+        SHARED_DATA_DIR=os.path.join(root, "dataset", "shared"),
+        DATA_RELOAD_INTERVAL="0",
+    )
+    env.pop("FIGURE_CACHE_DIR", None)
+
+    # 清掉上次运行留下的缓存，第一次启动包含聚合和发布，第二次只映射共享数据
+    for name in ("cache", "shared"):
+        shutil.rmtree(os.path.join(root, "dataset", name), ignore_errors=True)
+    results = {
+        "app_cold_start": start_app(root, env),
+        "app_warm_start": start_app(root, env),
+    }
+
+    print(f"[{scale}x] running stages and callbacks", file=sys.stderr)
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)],
+                            cwd=root, env=env, check=True, capture_output=True, text=True).stdout
+    results.update(json.loads(output.strip().splitlines()[-1]))
+    return {f"{scale}x/{name}": value for name, value in results.items()}
+
+
+def compare(results, baseline, tolerance):
+    # 返回回归列表；只比较两边都有的项目
+    regressions = []
+    print(f"{'benchmark':<44} {'base s':>9} {'now s':>9} {'base MB':>9} {'now MB':>9}")
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        flags = []
+        if now["seconds"] > base["seconds"] * tolerance and now["seconds"] - base["seconds"] > MIN_SECONDS:
+            flags.append("slower")
+        if now["peak_mb"] > base["peak_mb"] * tolerance and now["peak_mb"] - base["peak_mb"] > MIN_PEAK_MB:
+            flags.append("more memory")
+        print(f"{name:<44} {base['seconds']:9.4f} {now['seconds']:9.4f} {base['peak_mb']:9.1f} {now['peak_mb']:9.1f}"
+              f" {' '.join(flags)}")
+        if flags:
+            regressions.append((name, flags))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data pipeline and Dash callbacks")
+    parser.add_argument("--scales", default="1,10", help="comma separated data scales, e.g. 1,10,100")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "covid_benchmarks"),
+                        help="where synthetic data is generated and reused")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed ratio to the baseline")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.repeat)
+        return 0
+
+    results = {}
+    for scale in (int(s) for s in args.scales.split(",")):
+        results.update(run_scale(scale, args.workdir, args.repeat))
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "numpy": np.__version__,
+                    "pandas": pd.__version__,
+                },
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.2f}x")
+            return 1
+        print("No regressions")
+        return 0
+
+    print(f"{'benchmark':<44} {'seconds':>9} {'peak MB':>9}")
+    for name, value in results.items():
+        print(f"{name:<44} {value['seconds']:9.4f} {value['peak_mb']:9.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
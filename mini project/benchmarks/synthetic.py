@@ -0,0 +1,79 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# -----------------------------------
+# 生成与 JHU 全球宽表结构相同的合成数据（Province/State, Country/Region, Lat, Long, m/d/yy 日期列...）
+# scale=1 与当前数据规模相当（289 行、201 个国家、1143 天），scale=10/100 时行数和国家数按倍数增加
+#   python benchmarks/synthetic.py <输出目录> [scale]
+# -----------------------------------
+BASE_ROWS = 289
+BASE_COUNTRIES = 201
+N_DAYS = 1143
+START_DATE = "2020-01-22"
+FILES = {
+    "Confirmed": "time_series_covid19_confirmed_global.csv",
+    "Deaths": "time_series_covid19_deaths_global.csv",
+    "Recovered": "time_series_covid19_recovered_global.csv",
+}
+
+
+def synthetic_frames(scale=1, n_days=N_DAYS, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rows = BASE_ROWS * scale
+    n_countries = BASE_COUNTRIES * scale
+
+    # 前 n_countries 行每个国家一行，其余行作为已有国家的省份
+    country_of_row = np.concatenate([
+        np.arange(n_countries),
+        rng.integers(0, n_countries, n_rows - n_countries)
+    ])
+    countries = np.array([f"Country {i:05d}" for i in range(n_countries)], dtype=object)
+    provinces = np.array([np.nan if i < n_countries else f"Province {i:05d}" for i in range(n_rows)], dtype=object)
+    meta = pd.DataFrame({
+        "Province/State": provinces,
+        "Country/Region": countries[country_of_row],
+        "Lat": rng.uniform(-60, 70, n_rows).round(4),
+        "Long": rng.uniform(-180, 180, n_rows).round(4),
+    })
+    date_columns = [f"{d.month}/{d.day}/{d:%y}" for d in pd.date_range(START_DATE, periods=n_days)]
+
+    # 每行一条随机的累计曲线：不同的开始日期和增长速度，偶尔有向下的修正
+    start = rng.integers(0, n_days // 3, n_rows)[:, None]
+    rate = rng.lognormal(3, 1.5, n_rows)[:, None]
+    days = np.arange(n_days)[None, :]
+    daily = rng.poisson(rate * (days >= start), (n_rows, n_days))
+    confirmed = np.cumsum(daily, axis=1)
+    deaths = (confirmed * rng.uniform(0.005, 0.03, n_rows)[:, None]).astype(np.int64)
+    recovered = (confirmed * 0.9).astype(np.int64)
+    # 与 JHU 一样，2021-08 之后不再报告康复人数
+    recovered[:, 565:] = 0
+
+    frames = {}
+    for name, values in (("Confirmed", confirmed), ("Deaths", deaths), ("Recovered", recovered)):
+        frames[name] = pd.concat([meta, pd.DataFrame(values, columns=date_columns)], axis=1)
+    # 康复表缺少少量省份行，和真实数据一样
+    recovered = frames["Recovered"]
+    missing = (recovered.index % 20 == 0) & recovered["Province/State"].notna()
+    frames["Recovered"] = recovered[~missing].reset_index(drop=True)
+    return frames
+
+
+def write_synthetic(root, scale=1, n_days=N_DAYS, seed=0):
+    # 写出 <root>/dataset/*.csv；已经生成过的规模直接复用
+    folder = os.path.join(root, "dataset")
+    os.makedirs(folder, exist_ok=True)
+    paths = {name: os.path.join(folder, filename) for name, filename in FILES.items()}
+    if all(os.path.exists(path) for path in paths.values()):
+        return folder
+    for name, df in synthetic_frames(scale, n_days, seed).items():
+        tmp_path = f"{paths[name]}.tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, paths[name])
+    return folder
+
+
+if __name__ == '__main__':
+    scale = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print("Synthetic data written to", write_synthetic(sys.argv[1], scale))
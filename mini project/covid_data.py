@@ -0,0 +1,101 @@
+import hashlib
+import os
+import threading
+import pandas as pd
+from aggregate import aggregate_global
+from storage import load_table, save_table, table_path, data_folder
+
+# -----------------------------------
+# 共享的数据准备模块：load -> groupby -> sort -> diff 只在这里实现一次
+# load_global() 的结果按源文件 (路径, mtime, 大小) 做缓存：
+# 进程内缓存 + dataset/cache/ 下的 Arrow 文件，gunicorn worker 和 dev server 重载时直接读取
+# -----------------------------------
+GLOBAL_TABLE = "global_covid19_dataset"
+RAW_SOURCES = [
+    "time_series_covid19_confirmed_global.csv",
+    "time_series_covid19_deaths_global.csv",
+    "time_series_covid19_recovered_global.csv",
+]
+cache_folder = os.path.join(data_folder, "cache")
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def source_files():
+    # 优先使用流水线生成的全局数据集，没有时直接用 JHU 宽表
+    path = table_path(GLOBAL_TABLE)
+    if os.path.exists(path):
+        return [path]
+    csv_path = os.path.join(data_folder, f"{GLOBAL_TABLE}.csv")
+    if os.path.exists(csv_path):
+        return [csv_path]
+    return [os.path.join(data_folder, name) for name in RAW_SOURCES]
+
+
+def dataset_version():
+    digest = hashlib.sha1()
+    for path in source_files():
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()[:16]
+
+
+def prepare_global(df_global):
+    df_grouped = df_global.groupby(["Country/Region", "Date"], observed=True).agg({
+        "Confirmed": "sum",
+        "Deaths": "sum",
+        "Recovered": "sum"
+    }).reset_index()
+    df_grouped = df_grouped.sort_values(["Country/Region", "Date"], ignore_index=True)
+    df_grouped["New_Confirmed"] = df_grouped.groupby("Country/Region", observed=True)["Confirmed"].diff().fillna(0)
+    df_grouped["New_Deaths"] = df_grouped.groupby("Country/Region", observed=True)["Deaths"].diff().fillna(0)
+    df_grouped["New_Recovered"] = df_grouped.groupby("Country/Region", observed=True)["Recovered"].diff().fillna(0)
+    return df_grouped
+
+
+def build_global():
+    sources = source_files()
+    if len(sources) == 1:
+        return prepare_global(load_table(GLOBAL_TABLE))
+    df_confirmed, df_deaths, df_recovered = (pd.read_csv(path) for path in sources)
+    return aggregate_global(df_confirmed, df_deaths, df_recovered, with_new=True)
+
+
+def load_global():
+    version = dataset_version()
+    with _lock:
+        if version in _cache:
+            return _cache[version]
+
+        name = f"prepared_{version}"
+        if os.path.exists(table_path(name, cache_folder)):
+            df_grouped = load_table(name, cache_folder)
+        else:
+            df_grouped = build_global()
+            save_table(df_grouped, name, cache_folder)
+            remove_stale_artifacts(name)
+
+        _cache.clear()
+        _cache[version] = df_grouped
+        return df_grouped
+
+
+def clear_cache():
+    # 数据已发布到共享内存后，释放进程内的副本
+    with _lock:
+        _cache.clear()
+
+
+def remove_stale_artifacts(keep):
+    for filename in os.listdir(cache_folder):
+        if filename.startswith("prepared_") and filename != f"{keep}.arrow":
+            try:
+                os.remove(os.path.join(cache_folder, filename))
+            except OSError:
+                # 可能已被其它 worker 删除
+                pass
+
+
+def latest_by_country(df_grouped):
+    return df_grouped.sort_values("Date").groupby("Country/Region", observed=True).last().reset_index()
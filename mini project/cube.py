@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from derived import DERIVED_METRICS, derived_values, load_population
+from ranking import RANK_METRICS, build_rankings
+
+# -----------------------------------
+# (metric, country, day) 稠密数组
+# 日期范围 -> 切片（日期 -> 位置直接按天数计算），国家 -> 行号字典，每日新增 -> 沿 day 轴 np.diff
+# 回调只按国家取视图，不再扫描整张长表；滑动平均、每 10 万人等派生指标同样按 (指标, 国家, 天) 预先算好（见 derived.py）
+# 每天的国家排名也预先算好（见 ranking.py），前 N 名和某国名次不再筛选、排序整张表
+# -----------------------------------
+METRICS = ["Confirmed", "Deaths", "Recovered"]
+NEW_METRICS = ["New_Confirmed", "New_Deaths", "New_Recovered"]
+
+
+class Cube:
+    def __init__(self, values, countries, start_date, new_values=None, active=None, derived=None, rankings=None):
+        self.values = values
+        self.countries = list(countries)
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.start_date = pd.Timestamp(start_date)
+        self.dates = pd.date_range(self.start_date, periods=values.shape[2], freq="D")
+        # 第一天的新增记为 0，与 groupby().diff().fillna(0) 一致
+        if new_values is None:
+            new_values = np.diff(values, axis=2, prepend=values[:, :, :1])
+        self.new_values = new_values
+        # 派生指标在加载时一次性向量化计算；从共享数据映射时直接使用发布的数组
+        if active is None:
+            active = values[0] - values[1] - values[2]
+        self.active = active
+        if derived is None:
+            derived = derived_values(values, new_values, load_population(self.countries))
+        self.derived = derived
+        self.metric_index = {m: i for i, m in enumerate(METRICS)}
+        self.metric_index.update({m: i for i, m in enumerate(NEW_METRICS)})
+        self.metric_index.update({m: i for i, m in enumerate(DERIVED_METRICS)})
+        # rankings = (order, ranks, counts)，形状 (排名指标, 天, 国家) 和 (排名指标, 天)
+        if rankings is None:
+            rankings = build_rankings(self.metric_values, len(self.countries), len(self.dates))
+        self.order, self.ranks, self.ranked_counts = rankings
+        self.rank_index = {m: i for i, m in enumerate(RANK_METRICS)}
+
+    @property
+    def end_date(self):
+        return self.dates[-1]
+
+    def day_slice(self, start_date=None, end_date=None):
+        start = 0 if start_date is None else (pd.Timestamp(start_date) - self.start_date).days
+        stop = len(self.dates) if end_date is None else (pd.Timestamp(end_date) - self.start_date).days + 1
+        return slice(max(start, 0), max(min(stop, len(self.dates)), 0))
+
+    def day_position(self, date=None):
+        # 日期 -> 天的位置，超出范围时取最近的一端；None 表示最后一天
+        if date is None:
+            return len(self.dates) - 1
+        return min(max((pd.Timestamp(date) - self.start_date).days, 0), len(self.dates) - 1)
+
+    def country_positions(self, countries):
+        return [self.country_index[c] for c in countries if c in self.country_index]
+
+    def metric_values(self, metric):
+        # (国家, 天) 数组
+        if metric == "Active":
+            return self.active
+        return self.source(metric)[self.metric_index[metric]]
+
+    def select(self, metric, countries, start_date=None, end_date=None):
+        # 返回 (dates, 数组[len(countries), days])，未知国家直接跳过
+        days = self.day_slice(start_date, end_date)
+        rows = self.country_positions(countries)
+        return self.dates[days], self.metric_values(metric)[rows, days]
+
+    def source(self, metric):
+        if metric in NEW_METRICS:
+            return self.new_values
+        if metric in DERIVED_METRICS:
+            return self.derived
+        return self.values
+
+    def series(self, country, days=slice(None)):
+        # 单个国家所有指标（六个基础指标、Active 和派生指标）按日期排列的连续视图（不复制），未知国家返回 None
+        row = self.country_index.get(country)
+        if row is None:
+            return None
+        data = {metric: self.values[i, row, days] for i, metric in enumerate(METRICS)}
+        data.update({metric: self.new_values[i, row, days] for i, metric in enumerate(NEW_METRICS)})
+        data["Active"] = self.active[row, days]
+        data.update({metric: self.derived[i, row, days] for i, metric in enumerate(DERIVED_METRICS)})
+        return data
+
+    def top(self, metric, date=None, n=10):
+        # 某天 metric 最大的 n 个国家 [(国家, 数值)]，只读 order 的前 n 个元素；没有数值（NaN）的国家不参与排名
+        day = self.day_position(date)
+        rows = self.order[self.rank_index[metric], day, :min(n, self.ranked_count(metric, date))].astype(np.intp)
+        values = self.metric_values(metric)[rows, day]
+        return [(self.countries[row], value) for row, value in zip(rows, values)]
+
+    def rank(self, metric, country, date=None):
+        # 某国某天的名次（从 1 开始），未知国家或当天没有数值（NaN，例如没有人口数据的邮轮）时返回 None
+        row = self.country_index.get(country)
+        if row is None:
+            return None
+        # NaN 排在最后，名次不小于参与排名的国家数时就是 NaN
+        day = self.day_position(date)
+        position = int(self.ranks[self.rank_index[metric], day, row])
+        if position >= self.ranked_count(metric, date):
+            return None
+        return position + 1
+
+    def ranked_count(self, metric, date=None):
+        # 某天参与排名（数值不是 NaN）的国家数，构建排名索引时预先算好
+        return int(self.ranked_counts[self.rank_index[metric], self.day_position(date)])
+
+    def frame(self, countries=None, days=slice(None)):
+        # 转回 Country/Region, Date + 六个指标和 Active 的长表（只包含选中的国家和日期）
+        rows = np.arange(len(self.countries)) if countries is None else np.array(self.country_positions(countries), dtype=np.intp)
+        day_pos = np.arange(len(self.dates))[days]
+        cells = np.ix_(rows, day_pos)
+        data = {
+            "Country/Region": np.repeat(np.array(self.countries, dtype=object)[rows], len(day_pos)),
+            "Date": np.tile(self.dates.values[day_pos], len(rows)),
+        }
+        for i, metric in enumerate(METRICS):
+            data[metric] = self.values[i][cells].ravel()
+        data["Active"] = self.active[cells].ravel()
+        for i, metric in enumerate(NEW_METRICS):
+            data[metric] = self.new_values[i][cells].ravel()
+        return pd.DataFrame(data)
+
+    def latest_frame(self):
+        return self.frame(days=[len(self.dates) - 1])
+
+
+def build_cube(df_grouped):
+    # df_grouped: Country/Region, Date, Confirmed, Deaths, Recovered 的长表
+    countries = sorted(df_grouped["Country/Region"].unique())
+    start_date = df_grouped["Date"].min()
+    n_days = (df_grouped["Date"].max() - start_date).days + 1
+
+    country_pos = pd.Categorical(df_grouped["Country/Region"], categories=countries).codes
+    day_pos = ((df_grouped["Date"] - start_date) // pd.Timedelta(days=1)).to_numpy()
+
+    peak = df_grouped[METRICS].max().max()
+    dtype = np.int32 if peak < np.iinfo(np.int32).max else np.int64
+    values = np.zeros((len(METRICS), len(countries), n_days), dtype=dtype)
+    for i, metric in enumerate(METRICS):
+        values[i, country_pos, day_pos] = df_grouped[metric].fillna(0).to_numpy()
+    return Cube(values, countries, start_date)
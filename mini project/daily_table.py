@@ -0,0 +1,97 @@
+import math
+import pandas as pd
+
+# -----------------------------------
+# Daily Info 表格的服务端分页、排序和筛选（page_action / sort_action / filter_action = 'custom'）
+# 数据来自 cube.frame()，只取选中的国家和日期窗口；浏览器每次只收到当前一页
+# filter_query 使用 DataTable 的筛选语法，例如 {Confirmed} > 1000 && {Date} datestartswith 2021-03
+# -----------------------------------
+TABLE_COLUMNS = [
+    {"name": "Country/Region", "id": "Country/Region"},
+    {"name": "Date", "id": "Date"},
+    {"name": "Confirmed", "id": "Confirmed", "type": "numeric"},
+    {"name": "Deaths", "id": "Deaths", "type": "numeric"},
+    {"name": "Recovered", "id": "Recovered", "type": "numeric"},
+    {"name": "Active", "id": "Active", "type": "numeric"},
+    {"name": "New Confirmed", "id": "New_Confirmed", "type": "numeric"},
+    {"name": "New Deaths", "id": "New_Deaths", "type": "numeric"},
+    {"name": "New Recovered", "id": "New_Recovered", "type": "numeric"}
+]
+OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "]
+]
+
+
+def split_filter_part(filter_part):
+    # "{Confirmed} > 1000" -> ("Confirmed", "gt", 1000.0)
+    for operator_type in OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find("{") + 1: name_part.rfind("}")]
+                value_part = value_part.strip()
+                if value_part and value_part[0] == value_part[-1] and value_part[0] in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + value_part[0], value_part[0])
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+
+def comparable_value(series, value):
+    # 把筛选值转换成列的类型，例如 {Confirmed} > abc、{Country/Region} > 3；无法转换时返回 None
+    if pd.api.types.is_datetime64_any_dtype(series):
+        try:
+            value = pd.Timestamp(str(value))
+        except ValueError:
+            return None
+        return None if pd.isna(value) else value
+    if pd.api.types.is_numeric_dtype(series):
+        value = pd.to_numeric(value, errors="coerce")
+        return None if pd.isna(value) else value
+    return str(value)
+
+
+def apply_filter(df, filter_query):
+    # 无法识别的列、类型不匹配的值：跳过这一部分筛选
+    for filter_part in (filter_query or "").split(" && "):
+        column, operator, value = split_filter_part(filter_part)
+        if column not in df.columns:
+            continue
+        if operator in ("eq", "ne", "lt", "le", "gt", "ge"):
+            value = comparable_value(df[column], value)
+            if value is None:
+                continue
+            df = df.loc[getattr(df[column], operator)(value)]
+        elif operator == "contains":
+            df = df.loc[df[column].astype(str).str.contains(str(value), case=False, regex=False)]
+        elif operator == "datestartswith":
+            df = df.loc[df[column].astype(str).str.startswith(str(value))]
+    return df
+
+
+def table_page(df, filter_query, sort_by, page_current, page_size):
+    # 返回 (当前页记录, 总页数, 当前页)；当前页按总页数截断后写回表格
+    df = apply_filter(df, filter_query)
+    if sort_by:
+        df = df.sort_values(
+            [col["column_id"] for col in sort_by],
+            ascending=[col["direction"] == "asc" for col in sort_by],
+            kind="stable"
+        )
+    page_count = max(math.ceil(len(df) / page_size), 1)
+    # 筛选或选择变化后总页数可能变少
+    page_current = min(page_current or 0, page_count - 1)
+    page = df.iloc[page_current * page_size:(page_current + 1) * page_size]
+    page = page.assign(Date=page["Date"].dt.strftime("%Y-%m-%d"))
+    return page.to_dict("records"), page_count, page_current
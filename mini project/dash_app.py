@@ -0,0 +1,61 @@
+import threading
+import dash
+import dash_bootstrap_components as dbc
+from metrics import instrument_callbacks
+from series_api import register_series_routes
+from heatmap import register_heatmap_routes, warm_heatmaps
+
+# -----------------------------------
+# Dash app 和各页面共享的数据集
+# 页面模块（page_*.py）从这里导入 app 声明回调；global_covid_dashboard.py 负责导航和路由。
+# 数据集在第一次有请求用到时才映射（get_datasets），导入 app 时不读取数据、不生成图表，
+# worker 启动很快；gunicorn 的 on_starting 已经预先发布好共享数据（见 gunicorn.conf.py）。
+# -----------------------------------
+# compress=True：回调响应和 /data/*.json 用 gzip/br 压缩（flask-compress）
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.FLATLY], suppress_callback_exceptions=True, compress=True)
+# 每个 @app.callback 的耗时、负载和缓存统计，见 /metrics
+instrument_callbacks(app)
+server = app.server
+
+# 页面每隔多久检查一次数据集版本，有新版本时刷新下拉框、日期范围和图表
+RELOAD_CHECK_MS = 60000
+
+_lock = threading.Lock()
+_datasets = None
+
+
+def warm_cube_heatmaps(version, cube):
+    warm_heatmaps(version, cube.frame, cube.latest_frame)
+
+
+def get_datasets():
+    # 数据集以 cube 的形式发布在共享的内存映射文件中，各 worker 零拷贝映射（见 shared_data.py）；
+    # DatasetManager 在后台检查新数据并原子地切换 snapshot
+    global _datasets
+    with _lock:
+        if _datasets is None:
+            from dataset_manager import DatasetManager
+            datasets = DatasetManager()
+            datasets.on_swap(warm_cube_heatmaps)
+            # 热力图在后台预先生成，不阻塞第一个请求
+            threading.Thread(target=warm_cube_heatmaps, args=datasets.get(), daemon=True).start()
+            _datasets = datasets.start()
+        return _datasets
+
+
+def snapshot():
+    # 返回 (版本, cube)；回调开头取一次，整个回调使用同一个版本
+    return get_datasets().get()
+
+
+def country_options(cube):
+    return [{"label": country, "value": country} for country in cube.countries]
+
+
+def heatmap_data():
+    version, cube = snapshot()
+    return version, cube.frame, cube.latest_frame
+
+
+register_heatmap_routes(server, heatmap_data)
+register_series_routes(server, snapshot)
@@ -0,0 +1,63 @@
+import os
+import threading
+import time
+from shared_data import shared_folder, ensure_published, attach
+
+# -----------------------------------
+# 数据集热更新，不需要重启 Dash / gunicorn worker
+# 后台线程定期检查源文件和人口表的版本（shared_data.published_version），有新数据时由一个进程重新发布共享 cube，
+# 各 worker 映射新版本后一次性替换 snapshot = (版本, cube)。
+# 回调开头调用 get() 取一次 snapshot 并一直使用它，替换发生在回调执行中也不会读到一半新一半旧的数据。
+# -----------------------------------
+RELOAD_INTERVAL = int(os.environ.get("DATA_RELOAD_INTERVAL", "300"))
+
+
+class DatasetManager:
+    def __init__(self, folder=shared_folder, interval=RELOAD_INTERVAL):
+        self.folder = folder
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        version = ensure_published(folder)
+        self.snapshot = attach(folder, version)
+
+    def get(self):
+        # 返回 (版本, cube)
+        return self.snapshot
+
+    @property
+    def version(self):
+        return self.snapshot[0]
+
+    def on_swap(self, listener):
+        # listener(version, cube) 在每次切换到新版本后调用，例如预生成热力图
+        self._listeners.append(listener)
+
+    def refresh(self):
+        with self._lock:
+            # 源数据没有变化时 ensure_published 只做一次 stat
+            version = ensure_published(self.folder)
+            if version == self.snapshot[0]:
+                return False
+            self.snapshot = attach(self.folder, version)
+        for listener in self._listeners:
+            listener(*self.snapshot)
+        return True
+
+    def watch_loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self.refresh():
+                    print("Dataset reloaded:", self.version)
+            except Exception as e:
+                # 源文件正在被写入等情况，下一轮再试，继续使用当前 snapshot
+                print(f"Dataset reload failed: {e}")
+
+    def start(self):
+        with self._lock:
+            if self._watcher is None and self.interval > 0:
+                self._watcher = threading.Thread(target=self.watch_loop, daemon=True)
+                self._watcher.start()
+        return self
@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import pandas as pd
+
+# -----------------------------------
+# 派生指标：滑动平均、每 10 万人、病死率、增长率、倍增时间
+# 在构建 cube 时对所有国家一次性向量化计算（沿 day 轴的累计和 / 错位相除），
+# 结果是 (指标, 国家, 天) 的 float32 数组，和基础指标一起发布到共享数据（见 shared_data.py），
+# 每个数据集版本只算一次，回调里只取视图。没有人口数据或分母为 0 的位置为 NaN。
+# -----------------------------------
+POPULATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset", "population.csv")
+GROWTH_WINDOW = 7
+
+DERIVED_METRICS = [
+    "New_Confirmed_7d",
+    "New_Confirmed_14d",
+    "New_Deaths_7d",
+    "New_Deaths_14d",
+    "Confirmed_per_100k",
+    "Deaths_per_100k",
+    "New_Confirmed_7d_per_100k",
+    "CFR",
+    "Growth_Rate",
+    "Doubling_Time",
+]
+METRIC_LABELS = {
+    "Confirmed": "Cumulative Confirmed",
+    "Deaths": "Cumulative Deaths",
+    "Recovered": "Cumulative Recovered",
+    "Active": "Active",
+    "New_Confirmed": "New Confirmed",
+    "New_Deaths": "New Deaths",
+    "New_Recovered": "New Recovered",
+    "New_Confirmed_7d": "New Confirmed (7-day average)",
+    "New_Confirmed_14d": "New Confirmed (14-day average)",
+    "New_Deaths_7d": "New Deaths (7-day average)",
+    "New_Deaths_14d": "New Deaths (14-day average)",
+    "Confirmed_per_100k": "Confirmed per 100k",
+    "Deaths_per_100k": "Deaths per 100k",
+    "New_Confirmed_7d_per_100k": "New Confirmed per 100k (7-day average)",
+    "CFR": "Case Fatality Ratio (%)",
+    "Growth_Rate": "Growth Rate (% per day, 7-day)",
+    "Doubling_Time": "Doubling Time (days)",
+}
+
+
+def population_version(path=None):
+    # 人口表的 (mtime, 大小)，编辑人口表后派生指标需要重新计算（见 shared_data.published_version）
+    path = path or POPULATION_FILE
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "none"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_population(countries, path=POPULATION_FILE):
+    # 按 countries 的顺序返回人口数组，表中没有的国家（邮轮、奥运会等）为 NaN
+    try:
+        table = pd.read_csv(path).set_index("Country/Region")["Population"]
+    except FileNotFoundError:
+        return np.full(len(countries), np.nan)
+    return table.reindex(countries).to_numpy(dtype=float)
+
+
+def rolling_mean(values, window):
+    # 沿最后一维的滑动平均（包含当天），前 window-1 天按已有的天数平均
+    total = np.cumsum(values, axis=-1, dtype=np.float64)
+    total[..., window:] -= total[..., :-window].copy()
+    return total / np.minimum(np.arange(1, values.shape[-1] + 1), window)
+
+
+def ratio(numerator, denominator, scale=1.0):
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator * scale, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def derived_values(values, new_values, population):
+    # values / new_values: (Confirmed/Deaths/Recovered, 国家, 天)；population: (国家,)
+    # 逐个指标写入 float32 结果，中间的 float64 数组同时只保留几个
+    out = np.empty((len(DERIVED_METRICS),) + values.shape[1:], dtype=np.float32)
+    index = {metric: i for i, metric in enumerate(DERIVED_METRICS)}
+    confirmed = values[0].astype(np.float64)
+    deaths = values[1].astype(np.float64)
+    population = np.asarray(population, dtype=float)[:, None]
+
+    new_confirmed_7d = rolling_mean(new_values[0], 7)
+    out[index["New_Confirmed_7d"]] = new_confirmed_7d
+    out[index["New_Confirmed_14d"]] = rolling_mean(new_values[0], 14)
+    out[index["New_Deaths_7d"]] = rolling_mean(new_values[1], 7)
+    out[index["New_Deaths_14d"]] = rolling_mean(new_values[1], 14)
+    out[index["Confirmed_per_100k"]] = ratio(confirmed, population, 1e5)
+    out[index["Deaths_per_100k"]] = ratio(deaths, population, 1e5)
+    out[index["New_Confirmed_7d_per_100k"]] = ratio(new_confirmed_7d, population, 1e5)
+    out[index["CFR"]] = ratio(deaths, confirmed, 100.0)
+
+    # 按 GROWTH_WINDOW 天前的累计确诊算平均日增长率 r = ln(C_t / C_{t-w}) / w
+    log_growth = np.full_like(confirmed, np.nan)
+    with np.errstate(divide="ignore"):
+        log_growth[:, GROWTH_WINDOW:] = np.log(
+            ratio(confirmed[:, GROWTH_WINDOW:], confirmed[:, :-GROWTH_WINDOW])
+        ) / GROWTH_WINDOW
+    log_growth[np.isinf(log_growth)] = np.nan
+    out[index["Growth_Rate"]] = np.expm1(log_growth) * 100
+    # 倍增时间只在增长时有定义
+    out[index["Doubling_Time"]] = ratio(np.log(2), log_growth)
+    return out
@@ -0,0 +1,135 @@
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from urllib.parse import quote
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from metrics import record_cache, record_upstream
+
+# -----------------------------------
+# disease.sh 客户端
+# 连接池 + 并发请求 + TTL 缓存 + single-flight（同一 URL 同时只发一个上游请求）
+# DISEASE_API_URL 可以指向本地 stub 服务；设置 DISEASE_CACHE_DIR 后多个 worker 通过该目录共享缓存
+# -----------------------------------
+BASE_URL = os.environ.get("DISEASE_API_URL", "https://disease.sh/v3/covid-19").rstrip("/")
+CACHE_DIR = os.environ.get("DISEASE_CACHE_DIR")
+DEFAULT_TTL = 60
+TIMEOUT = (3, 10)
+# 等待其它线程发出的同一请求最多这么久，超时按 requests.Timeout 处理，与发起请求的线程一致
+WAIT_TIMEOUT = sum(TIMEOUT)
+
+session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="disease-client")
+
+_lock = threading.Lock()
+_cache = {}
+_in_flight = {}
+
+
+def _cache_path(path):
+    return os.path.join(CACHE_DIR, hashlib.sha1(path.encode()).hexdigest() + ".json")
+
+
+def _cache_get(path, ttl):
+    now = time.time()
+    with _lock:
+        entry = _cache.get(path)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+
+    if CACHE_DIR:
+        try:
+            with open(_cache_path(path), encoding="utf-8") as f:
+                fetched_at, result = json.load(f)
+            if now - fetched_at < ttl:
+                result = tuple(result)
+                with _lock:
+                    _cache[path] = (fetched_at, result)
+                return result
+        except (OSError, ValueError):
+            pass
+    return None
+
+
+def _cache_set(path, result):
+    fetched_at = time.time()
+    with _lock:
+        _cache[path] = (fetched_at, result)
+
+    if CACHE_DIR:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            target = _cache_path(path)
+            tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump([fetched_at, list(result)], f)
+            os.replace(tmp_path, target)
+        except OSError as e:
+            print(f"Error writing disease.sh cache: {e}")
+
+
+def get_json(path, ttl=DEFAULT_TTL):
+    # 返回 (status_code, JSON 数据)；5xx 和网络错误不缓存，直接抛出异常
+    result = _cache_get(path, ttl)
+    record_cache("disease", result is not None)
+    if result is not None:
+        return result
+
+    with _lock:
+        future = _in_flight.get(path)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _in_flight[path] = future
+    if not is_owner:
+        try:
+            return future.result(timeout=WAIT_TIMEOUT)
+        except FutureTimeout:
+            raise requests.Timeout(f"waited {WAIT_TIMEOUT}s for in-flight request {path}") from None
+
+    start = time.perf_counter()
+    status = "error"
+    try:
+        r = session.get(f"{BASE_URL}/{path}", timeout=TIMEOUT)
+        status = r.status_code
+        if r.status_code >= 500:
+            r.raise_for_status()
+        result = (r.status_code, r.json() if r.status_code == 200 else None)
+        _cache_set(path, result)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        record_upstream("disease.sh", time.perf_counter() - start, status)
+        with _lock:
+            _in_flight.pop(path, None)
+
+
+def country_path(country):
+    return f"countries/{quote(country)}?strict=true"
+
+
+def history_path(country, lastdays):
+    return f"historical/{quote(country)}?lastdays={lastdays}"
+
+
+def fetch_country(country, lastdays=8):
+    # 并发获取国家实时摘要和最近 lastdays 天的历史数据，返回两个 Future
+    # 复制 contextvars，上游耗时和缓存命中记到发起请求的回调上（见 metrics.py）
+    summary = _executor.submit(contextvars.copy_context().run, get_json, country_path(country))
+    history = _executor.submit(contextvars.copy_context().run, get_json, history_path(country, lastdays))
+    return summary, history
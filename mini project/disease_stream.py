@@ -0,0 +1,124 @@
+import codecs
+import json
+import numpy as np
+import pandas as pd
+import disease_client
+
+# -----------------------------------
+# historical?lastdays=all 的流式解析
+# 边下载边逐个解析国家对象（不把整个 JSON 载入内存），
+# 日期字符串每个只解析一次，各列以数组拼接，不再为每个 (国家, 日期) 构造 dict
+# -----------------------------------
+DATE_FORMAT = "%m/%d/%y"
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(chunks):
+    # chunks: bytes 块的迭代器，内容是一个 JSON 数组；逐个产出数组元素
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    started = False
+    chunks = iter(chunks)
+    exhausted = False
+
+    while True:
+        # 跳过空白、数组开头的 '[' 和元素之间的 ','
+        while pos < len(buf) and (buf[pos].isspace() or buf[pos] == "," or (buf[pos] == "[" and not started)):
+            started = started or buf[pos] == "["
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+
+        if pos < len(buf):
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield obj
+                pos = end
+                continue
+
+        if exhausted:
+            return
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buf = buf[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+
+def historical_frame(records):
+    # records: disease.sh historical 接口的国家对象迭代器
+    date_index = {}
+    country_index = {}
+    country_codes = []
+    date_codes = []
+    confirmed = []
+    deaths = []
+    recovered = []
+    last_keys = None
+    last_codes = None
+
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        # 没有国家名（缺失、null、空字符串）的对象无法归到任何国家，跳过
+        country = record.get("country")
+        if not isinstance(country, str) or not country.strip():
+            continue
+        timeline = record.get("timeline") or {}
+        cases = timeline.get("cases") or {}
+        if not cases:
+            continue
+        death_counts = timeline.get("deaths") or {}
+        recovered_counts = timeline.get("recovered") or {}
+
+        keys = list(cases)
+        if keys != last_keys:
+            last_codes = np.fromiter(
+                (date_index.setdefault(k, len(date_index)) for k in keys), dtype=np.int32, count=len(keys)
+            )
+            last_keys = keys
+
+        # 同一国家可能有多个省份对象，共用一个国家编码，后续由 prepare_global 聚合
+        code = country_index.setdefault(country.strip(), len(country_index))
+        country_codes.append(np.full(len(keys), code, dtype=np.int32))
+        date_codes.append(last_codes)
+        confirmed.append(np.fromiter(cases.values(), dtype=np.int64, count=len(keys)))
+        deaths.append(aligned_values(death_counts, keys))
+        recovered.append(aligned_values(recovered_counts, keys))
+
+    if not country_index:
+        return pd.DataFrame(columns=["Country/Region", "Date", "Confirmed", "Deaths", "Recovered"])
+
+    # 每个不同的日期字符串只解析一次
+    unique_dates = pd.to_datetime(pd.Index(list(date_index)), format=DATE_FORMAT, errors="coerce")
+    df = pd.DataFrame({
+        "Country/Region": pd.Categorical.from_codes(np.concatenate(country_codes), categories=list(country_index)),
+        "Date": unique_dates[np.concatenate(date_codes)],
+        "Confirmed": np.concatenate(confirmed),
+        "Deaths": np.concatenate(deaths),
+        "Recovered": np.concatenate(recovered),
+    })
+    return df.dropna(subset=["Date"])
+
+
+def aligned_values(counts, keys):
+    # 与 cases 的日期键顺序相同时直接取值，否则按日期查找，缺失记为 0
+    if len(counts) == len(keys) and list(counts) == keys:
+        return np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+    return np.fromiter((counts.get(k, 0) for k in keys), dtype=np.int64, count=len(keys))
+
+
+def fetch_historical_frame(lastdays="all"):
+    url = f"{disease_client.BASE_URL}/historical?lastdays={lastdays}"
+    with disease_client.session.get(url, stream=True, timeout=(5, 300)) as r:
+        r.raise_for_status()
+        return historical_frame(iter_json_array(r.iter_content(chunk_size=CHUNK_SIZE)))
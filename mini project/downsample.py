@@ -0,0 +1,55 @@
+import numpy as np
+
+# -----------------------------------
+# Largest-Triangle-Three-Buckets 降采样
+# 长时间序列在服务端缩减到和图表宽度相当的点数，保留峰值和拐点；
+# 所有曲线放在一个二维数组里一起计算，循环次数只和目标点数有关
+# -----------------------------------
+
+
+def lttb_indices(values, n_out):
+    # values: (曲线数, 天数)；返回每条曲线保留的位置 (曲线数, n_out)，首尾两点总是保留
+    values = np.asarray(values, dtype=float)
+    n_traces, n = values.shape
+    if n_out >= n or n_out < 3:
+        return np.tile(np.arange(n), (n_traces, 1))
+
+    rows = np.arange(n_traces)
+    # 第一个和最后一个点之外的 n_out - 2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    picks = np.empty((n_traces, n_out), dtype=np.intp)
+    picks[:, 0] = 0
+    picks[:, -1] = n - 1
+
+    selected = np.zeros(n_traces, dtype=np.intp)
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        # 下一个桶的平均点
+        avg_x = (hi + next_hi - 1) / 2
+        avg_y = values[:, hi:next_hi].mean(axis=1)
+        # 上一个选中点、下一个桶平均点与本桶各点组成的三角形面积，取最大者
+        prev_x = selected.astype(float)
+        prev_y = values[rows, selected]
+        x = np.arange(lo, hi)
+        area = np.abs(
+            (prev_x - avg_x)[:, None] * (values[:, lo:hi] - prev_y[:, None])
+            - (prev_x[:, None] - x) * (avg_y - prev_y)[:, None]
+        )
+        selected = lo + area.argmax(axis=1)
+        picks[:, i + 1] = selected
+    return picks
+
+
+def downsample_series(dates, series, metrics, n_out):
+    # series: 每个国家一个 {指标: 数组}；返回同样结构的 {指标: (日期, 数值)}
+    sampled = [{} for _ in series]
+    for metric in metrics:
+        if not series:
+            break
+        values = np.stack([data[metric] for data in series])
+        # 派生指标中没有定义的天（NaN）按 0 参与选点，返回的仍是原值
+        picks = lttb_indices(np.nan_to_num(values), n_out)
+        for i, data in enumerate(series):
+            sampled[i][metric] = (dates[picks[i]], data[metric][picks[i]])
+    return sampled
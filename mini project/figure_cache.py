@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+from metrics import record_cache, record_cache_error
+
+# -----------------------------------
+# 图表缓存：key = (数据集版本, 排序后的国家集合, 日期范围)
+# 进程内 LRU（条目数有上限），可选文件系统后端让多个 gunicorn worker 共享命中；
+# 数据集版本变化时整个缓存失效；文件后端出错时记录日志并计入 cache_errors_total（见 /metrics），缓存退化为只用内存
+# -----------------------------------
+logger = logging.getLogger(__name__)
+
+
+def figure_key(countries, start_date, end_date):
+    # 国家顺序和重复不影响 key；日期统一成 YYYY-MM-DD
+    start = pd.Timestamp(start_date).strftime("%Y-%m-%d") if start_date else None
+    end = pd.Timestamp(end_date).strftime("%Y-%m-%d") if end_date else None
+    return tuple(sorted(set(countries or []))), start, end
+
+
+class FigureCache:
+    def __init__(self, max_entries=128, folder=None, max_files=1024):
+        self.max_entries = max_entries
+        self.folder = folder
+        self.max_files = max_files
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+
+    def get_or_build(self, version, key, build):
+        value = self.get(version, key)
+        if value is None:
+            value = build()
+            self.set(version, key, value)
+        return value
+
+    def get(self, version, key):
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache("figure", True)
+                return self._entries[key]
+
+        value = self._read_file(version, key)
+        record_cache("figure", value is not None)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def set(self, version, key, value):
+        with self._lock:
+            self._check_version(version)
+            self._store(key, value)
+        self._write_file(version, key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _check_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ---------- 文件系统后端 ----------
+    def _path(self, version, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.folder, f"{version}_{digest}.json")
+
+    def _read_file(self, version, key):
+        if not self.folder:
+            return None
+        path = self._path(version, key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Error reading figure cache %s: %s", path, e)
+            record_cache_error("figure", "read")
+            return None
+
+    def _write_file(self, version, key, value):
+        if not self.folder:
+            return
+        path = self._path(version, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, cls=PlotlyJSONEncoder)
+            os.replace(tmp_path, path)
+            self._evict_files(version)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Error writing figure cache %s: %s", path, e)
+            record_cache_error("figure", "write")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict_files(self, version):
+        entries = []
+        for filename in os.listdir(self.folder):
+            path = os.path.join(self.folder, filename)
+            if not filename.endswith(".json"):
+                continue
+            if not filename.startswith(f"{version}_"):
+                # 旧版本数据集的缓存
+                entries.append((0, path))
+                continue
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass
+        entries.sort()
+        stale = [path for mtime, path in entries if mtime == 0]
+        fresh = [path for mtime, path in entries if mtime != 0]
+        for path in stale + fresh[:max(len(fresh) - self.max_files, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
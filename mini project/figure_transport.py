@@ -0,0 +1,13 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------------
+# 图表的紧凑传输格式
+# plotly>=6 把 numpy 数组序列化成 base64 类型数组 {"dtype": ..., "bdata": ...}，不再逐个写成 JSON 数字；
+# 日期列表会被写成 ISO 字符串，所以日期轴改传 epoch 毫秒（float64，可精确表示，并能编码成类型数组），
+# 再把轴设为 type="date"。响应压缩由 Dash(compress=True) / flask-compress 完成。
+# -----------------------------------
+
+
+def epoch_ms(dates):
+    return pd.DatetimeIndex(dates).values.astype("datetime64[ms]").astype(np.int64).astype(np.float64)
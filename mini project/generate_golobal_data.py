@@ -1,24 +1,18 @@
+import os
 import pandas as pd
+from aggregate import aggregate_global
+from storage import save_table
 
-# 加载三个转换后的 CSV 文件（假设它们都存放在 "dataset" 文件夹中）
-df_confirmed = pd.read_csv('dataset/converted_confirmed_data.csv')
-df_deaths = pd.read_csv('dataset/converted_deaths_data.csv')
-df_recovered = pd.read_csv('dataset/converted_recovered_data.csv')
+data_folder = 'dataset'
 
-# 将日期列转换为 datetime 格式
-df_confirmed['Date'] = pd.to_datetime(df_confirmed['Date'])
-df_deaths['Date'] = pd.to_datetime(df_deaths['Date'])
-df_recovered['Date'] = pd.to_datetime(df_recovered['Date'])
+# 直接读取 JHU 宽表，按国家在宽表上聚合后只做一次 melt（见 aggregate.py）
+df_confirmed = pd.read_csv(os.path.join(data_folder, 'time_series_covid19_confirmed_global.csv'))
+df_deaths = pd.read_csv(os.path.join(data_folder, 'time_series_covid19_deaths_global.csv'))
+df_recovered = pd.read_csv(os.path.join(data_folder, 'time_series_covid19_recovered_global.csv'))
 
-# 按 "Country/Region" 和 "Date" 聚合数据
-confirmed_grouped = df_confirmed.groupby(['Country/Region', 'Date'])['Confirmed'].sum().reset_index()
-deaths_grouped = df_deaths.groupby(['Country/Region', 'Date'])['Deaths'].sum().reset_index()
-recovered_grouped = df_recovered.groupby(['Country/Region', 'Date'])['Recovered'].sum().reset_index()
+# 聚合、合并并计算每日新增（与 incremental.py 写出的表结构一致）
+df_global = aggregate_global(df_confirmed, df_deaths, df_recovered, with_new=True)
 
-# 合并数据
-df_global = pd.merge(confirmed_grouped, deaths_grouped, on=['Country/Region', 'Date'], how='outer')
-df_global = pd.merge(df_global, recovered_grouped, on=['Country/Region', 'Date'], how='outer')
-
-# 保存全局数据集为 CSV 文件
-df_global.to_csv('global_covid19_dataset.csv', index=False)
-print("全局数据集已保存为 'global_covid19_dataset.csv'")
+# 保存全局数据集为 Arrow 文件，供 dashboard 等直接加载
+path = save_table(df_global, 'global_covid19_dataset')
+print(f"全局数据集已保存为 '{path}'")
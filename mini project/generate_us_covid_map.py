@@ -1,65 +1,48 @@
 import os
-import pandas as pd
-import folium
-import folium.plugins as plugins
-import webbrowser
-
-# -------------------------------
-# 1. Load US county-level data
-# -------------------------------
-
-df_confirmed_us = pd.read_csv('time_series_covid19_confirmed_US.csv')
-df_deaths_us = pd.read_csv('time_series_covid19_deaths_US.csv')
-
-
-id_vars = ['Province_State', 'Admin2', 'FIPS', 'Lat', 'Long_']
-
-
-df_confirmed_us_long = df_confirmed_us.melt(id_vars=id_vars, var_name='Date', value_name='Confirmed')
-df_deaths_us_long = df_deaths_us.melt(id_vars=id_vars, var_name='Date', value_name='Deaths')
+import sys
+from us_counties import load_us_latest
+from us_map import county_map_figure, county_labels, save_county_map_json, valid_points
 
-
-df_confirmed_us_long['Date'] = pd.to_datetime(df_confirmed_us_long['Date'], errors='coerce')
-df_deaths_us_long['Date'] = pd.to_datetime(df_deaths_us_long['Date'], errors='coerce')
-
-
-df_us = pd.merge(df_confirmed_us_long, df_deaths_us_long, on=id_vars + ['Date'], how='outer')
+# 用法：python generate_us_covid_map.py [webgl|folium]
+#   webgl（默认）：生成独立的 us_covid_county_map.json（plotly 图表 JSON，和 dashboard 的 /usmap 页面相同的 WebGL 图层）
+#   folium：生成独立的 us_covid_county_map.html 并在浏览器中打开
+mode = sys.argv[1] if len(sys.argv) > 1 else "webgl"
 
 # -------------------------------
-# 2. 筛选最新日期数据并按县聚合
+# 1. 只读取最新一天的 US 县级数据
+# 扫描表头后用 usecols 只读县信息和最新日期列，确诊和死亡按整数 FIPS 连接
 # -------------------------------
-latest_date_us = df_us['Date'].max()
+latest_date_us, df_county = load_us_latest()
 print("Latest US data date:", latest_date_us)
 
-df_us_latest = df_us[df_us['Date'] == latest_date_us]
-
-df_county = df_us_latest.groupby(['Province_State', 'Admin2']).agg({
-    'Confirmed': 'sum',
-    'Deaths': 'sum',
-    'Lat': 'mean',
-    'Long_': 'mean'
-}).reset_index()
-
 print("County-level aggregated data preview:")
 print(df_county.head())
 
 # -------------------------------
-# 3. 使用 MarkerCluster 创建县级地图
+# 2. 生成县级地图
 # -------------------------------
-us_map = folium.Map(location=[37.8, -96], zoom_start=5)
-
-marker_cluster = plugins.MarkerCluster().add_to(us_map)
-
-for idx, row in df_county.iterrows():
-    county_name = f"{row['Admin2']}, {row['Province_State']}" if pd.notnull(row['Admin2']) else row['Province_State']
-    popup_text = f"{county_name}: {int(row['Confirmed']):,} Confirmed, {int(row['Deaths']):,} Deaths"
-    folium.Marker(
-        location=[row['Lat'], row['Long_']],
-        popup=popup_text,
-        icon=folium.Icon(color="blue", icon="info-sign")
-    ).add_to(marker_cluster)
-
-output_file = 'us_covid_county_map.html'
-us_map.save(output_file)
-print(f"US county-level COVID-19 map saved as '{output_file}'")
-webbrowser.open('file://' + os.path.realpath(output_file))
+if mode == "folium":
+    import folium
+    import folium.plugins as plugins
+    import webbrowser
+
+    us_map = folium.Map(location=[37.8, -96], zoom_start=5)
+
+    # 所有县的 [lat, lon, popup] 一次性交给 FastMarkerCluster，在浏览器端生成标记
+    df_points = valid_points(df_county)
+    points = list(zip(df_points['Lat'], df_points['Long_'], county_labels(df_points)))
+    callback = """
+    function (row) {
+        return L.marker(new L.LatLng(row[0], row[1])).bindPopup(row[2]);
+    }
+    """
+    plugins.FastMarkerCluster(points, callback=callback).add_to(us_map)
+
+    output_file = 'us_covid_county_map.html'
+    us_map.save(output_file)
+    print(f"US county-level COVID-19 map saved as '{output_file}'")
+    webbrowser.open('file://' + os.path.realpath(output_file))
+else:
+    fig = county_map_figure(df_county, title=f"US COVID-19 Confirmed Cases by County ({latest_date_us:%Y-%m-%d})")
+    output_file = save_county_map_json(fig, 'us_covid_county_map.json')
+    print(f"US county-level COVID-19 map saved as '{output_file}'")
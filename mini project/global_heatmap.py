@@ -4,28 +4,24 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html, Input, Output
 import plotly.graph_objs as go
-import plotly.express as px
-import requests
+import owid_mirror
+from covid_data import load_global, latest_by_country, dataset_version
+from cube import build_cube
+from figure_transport import epoch_ms
+from metrics import instrument_callbacks
+from heatmap import HEATMAP_CLIENTSIDE_JS, register_heatmap_routes, warm_heatmaps
+from us_map import US_MAP_CLIENTSIDE_JS, register_us_map_route
+from us_counties import latest_map_figure
 
 # -----------------------------------
-# 1. Load and preprocess local CSV data
+# 1. Load the prepared dataset (cached by covid_data)
 # -----------------------------------
-df_global = pd.read_csv("dataset/global_covid19_dataset.csv")
-df_global["Date"] = pd.to_datetime(df_global["Date"])
-
-df_grouped = df_global.groupby(["Country/Region", "Date"]).agg({
-    "Confirmed": "sum",
-    "Deaths": "sum",
-    "Recovered": "sum"
-}).reset_index()
-
-df_grouped = df_grouped.sort_values(["Country/Region", "Date"])
-df_grouped["New_Confirmed"] = df_grouped.groupby("Country/Region")["Confirmed"].diff().fillna(0)
-df_grouped["New_Deaths"] = df_grouped.groupby("Country/Region")["Deaths"].diff().fillna(0)
-df_grouped["New_Recovered"] = df_grouped.groupby("Country/Region")["Recovered"].diff().fillna(0)
-
-df_latest = df_grouped.sort_values("Date").groupby("Country/Region").last().reset_index()
-countries = sorted(df_grouped["Country/Region"].unique())
+data_version = dataset_version()
+df_grouped = load_global()
+df_latest = latest_by_country(df_grouped)
+cube = build_cube(df_grouped)
+countries = cube.countries
+warm_heatmaps(data_version, lambda: df_grouped, lambda: df_latest)
 
 # -----------------------------------
 # 2. Page Layouts
@@ -47,10 +43,10 @@ global_layout = dbc.Container([
             html.Label("Select Date Range:", className="font-weight-bold"),
             dcc.DatePickerRange(
                 id="date-picker-range",
-                min_date_allowed=df_grouped["Date"].min(),
-                max_date_allowed=df_grouped["Date"].max(),
-                start_date=df_grouped["Date"].min(),
-                end_date=df_grouped["Date"].max(),
+                min_date_allowed=cube.start_date,
+                max_date_allowed=cube.end_date,
+                start_date=cube.start_date,
+                end_date=cube.end_date,
                 display_format="YYYY-MM-DD"
             )
         ], md=6)
@@ -61,14 +57,25 @@ global_layout = dbc.Container([
 
 us_map_layout = dbc.Container([
     dbc.Row(dbc.Col(html.H2("US COVID-19 Map", className="text-center mb-4"))),
-    dbc.Row(dbc.Col(html.Iframe(
-        src="/assets/us_covid_county_map.html",
-        style={"width": "100%", "height": "600px", "border": "none"}
+    dbc.Row(dbc.Col(dcc.Graph(
+        id="us-county-map",
+        config={"scrollZoom": True},
+        style={"height": "600px"}
     )))
 ], fluid=True)
 
 global_map_layout = dbc.Container([
     dbc.Row(dbc.Col(html.H2("Global COVID-19 Heatmap", className="text-center mb-4"))),
+    dbc.Row(dbc.Col(dcc.RadioItems(
+        id="heatmap-mode",
+        options=[
+            {"label": " Latest", "value": "latest"},
+            {"label": " Over time", "value": "animated"}
+        ],
+        value="latest",
+        inline=True,
+        inputStyle={"marginLeft": "15px"}
+    )), className="mb-2"),
     dbc.Row(dbc.Col(dcc.Graph(id="global-heatmap"))),
     dbc.Row(dbc.Col([
         html.Label("Query country-level COVID data:", className="font-weight-bold"),
@@ -86,8 +93,13 @@ global_map_layout = dbc.Container([
 # -----------------------------------
 # 3. App Layout
 # -----------------------------------
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.FLATLY])
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.FLATLY], compress=True)
+# 每个 @app.callback 的耗时、负载和缓存统计，见 /metrics
+instrument_callbacks(app)
 server = app.server
+register_heatmap_routes(server, lambda: (data_version, lambda: df_grouped, lambda: df_latest))
+register_us_map_route(server, latest_map_figure)
+owid_mirror.start_background_refresh()
 
 app.layout = html.Div([
     dcc.Location(id="url", refresh=False),
@@ -129,58 +141,46 @@ def display_page(pathname):
      Input("date-picker-range", "end_date")]
 )
 def update_global_graphs(selected_countries, start_date, end_date):
-    mask = (
-        (df_grouped["Date"] >= start_date) & 
-        (df_grouped["Date"] <= end_date) & 
-        (df_grouped["Country/Region"].isin(selected_countries))
-    )
-    filtered = df_grouped[mask]
+    selected_countries = [c for c in selected_countries or [] if c in cube.country_index]
+    days = cube.day_slice(start_date, end_date)
+    # 日期用 epoch 毫秒、数值用 numpy 视图，序列化为 base64 类型数组（见 figure_transport.py）
+    dates = epoch_ms(cube.dates[days])
 
     fig_cum = go.Figure()
     fig_daily = go.Figure()
 
     for country in selected_countries:
-        country_data = filtered[filtered["Country/Region"] == country]
+        data = cube.series(country, days)
         fig_cum.add_trace(go.Scatter(
-            x=country_data["Date"], y=country_data["Confirmed"],
+            x=dates, y=data["Confirmed"],
             mode="lines+markers", name=f"{country} Cumulative Confirmed"
         ))
         fig_daily.add_trace(go.Scatter(
-            x=country_data["Date"], y=country_data["New_Confirmed"],
+            x=dates, y=data["New_Confirmed"],
             mode="lines+markers", name=f"{country} New Confirmed"
         ))
 
-    fig_cum.update_layout(title="Cumulative Trends", template="plotly_white")
-    fig_daily.update_layout(title="Daily New Trends", template="plotly_white")
+    fig_cum.update_layout(title="Cumulative Trends", template="plotly_white", xaxis_type="date")
+    fig_daily.update_layout(title="Daily New Trends", template="plotly_white", xaxis_type="date")
 
     return fig_cum, fig_daily
 
 # -----------------------------------
-# 6. Heatmap using df_latest
+# 6. Heatmap: 预先生成的 JSON 由 /data/heatmap*.json 提供
 # -----------------------------------
-@app.callback(
+app.clientside_callback(
+    HEATMAP_CLIENTSIDE_JS,
     Output("global-heatmap", "figure"),
-    Input("url", "pathname")
+    [Input("url", "pathname"),
+     Input("heatmap-mode", "value")]
 )
-def update_global_heatmap(pathname):
-    if pathname != "/heatmap":
-        raise dash.exceptions.PreventUpdate
 
-    try:
-        fig = px.choropleth(
-            df_latest,
-            locations="Country/Region",
-            locationmode="country names",
-            color="Confirmed",
-            hover_name="Country/Region",
-            color_continuous_scale="Reds",
-            title="Global COVID-19 Confirmed Cases"
-        )
-        return fig
-
-    except Exception as e:
-        print(f"Error building heatmap: {e}")
-        return go.Figure()
+# US 县级地图：第一次请求 /data/us-county-map.json 时生成的 WebGL 图表，没有县级数据时显示提示
+app.clientside_callback(
+    US_MAP_CLIENTSIDE_JS,
+    Output("us-county-map", "figure"),
+    Input("url", "pathname")
+)
 
 # -----------------------------------
 # 7. Country Query from OWID
@@ -193,16 +193,14 @@ def query_country_data(country_name):
     if not country_name:
         return ""
 
-    url = "https://covid.ourworldindata.org/data/owid-covid-data.csv"
     try:
-        df = pd.read_csv(url)
-        df = df.sort_values("date").groupby("location").last().reset_index()
-        match = df[df["location"].str.lower() == country_name.strip().lower()]
+        if not owid_mirror.is_ready():
+            return html.Div("OWID data is still being downloaded, please try again shortly.", style={"color": "gray"})
 
-        if match.empty:
+        row = owid_mirror.lookup(country_name)
+        if row is None:
             return html.Div(f"No data found for '{country_name}'.", style={"color": "red"})
 
-        row = match.iloc[0]
         return html.Div([
             html.P(f"Country: {row['location']}"),
             html.P(f"Total Confirmed: {row['total_cases']:,}"),
@@ -0,0 +1,22 @@
+import os
+
+# /metrics 合并所有 worker 的统计（见 metrics.py），需要在导入 metrics 之前设置
+os.environ.setdefault("METRICS_MULTIPROC_DIR", os.path.join("dataset", "metrics"))
+
+from metrics import mark_process_dead, reset_multiproc_dir
+from shared_data import ensure_published
+
+# gunicorn -c gunicorn.conf.py global_covid_dashboard:server
+workers = 4
+bind = "0.0.0.0:8050"
+
+
+def on_starting(server):
+    # master 进程在 fork worker 之前发布一次共享数据，worker 启动时只需映射
+    ensure_published()
+    reset_multiproc_dir()
+
+
+def child_exit(server, worker):
+    # 退出的 worker 的统计并入 archived.json
+    mark_process_dead(worker.pid)
@@ -0,0 +1,110 @@
+import threading
+import plotly.io as pio
+from flask import Response, request
+from metrics import record_cache
+
+# -----------------------------------
+# 预先生成的全球热力图
+# choropleth 每个数据集版本只构建一次并序列化成 JSON，由 Flask 路由直接返回，
+# 页面上用 clientside callback 拉取，不再在每次进入 /heatmap 时调用 px.choropleth
+# -----------------------------------
+HEATMAP_URL = "/data/heatmap.json"
+ANIMATED_HEATMAP_URL = "/data/heatmap-animated.json"
+
+# 进入 /heatmap 或切换模式时在浏览器里拉取预先生成的图表
+HEATMAP_CLIENTSIDE_JS = """
+function(pathname, mode) {
+    if (pathname !== "/heatmap") {
+        return window.dash_clientside.no_update;
+    }
+    var url = mode === "animated" ? "%s" : "%s";
+    return fetch(url)
+        .then(function(response) { return response.json(); })
+        .catch(function() { return {"data": [], "layout": {}}; });
+}
+""" % (ANIMATED_HEATMAP_URL, HEATMAP_URL)
+
+_lock = threading.Lock()
+_json_cache = {}
+
+
+def heatmap_figure(df_latest):
+    # plotly.express 导入较慢（~120 ms），只在第一次生成图表时导入
+    import plotly.express as px
+    return px.choropleth(
+        df_latest,
+        locations="Country/Region",
+        locationmode="country names",
+        color="Confirmed",
+        hover_name="Country/Region",
+        color_continuous_scale="Reds",
+        title="Global COVID-19 Confirmed Cases"
+    )
+
+
+def animated_heatmap_figure(df_grouped, step=7):
+    # 每 step 天一帧（始终包含最新一天），用时间滑块播放
+    dates = df_grouped["Date"].drop_duplicates().sort_values()
+    frame_dates = set(dates.iloc[::step]) | {dates.iloc[-1]}
+    df_frames = df_grouped[df_grouped["Date"].isin(frame_dates)].sort_values("Date").copy()
+    df_frames["Day"] = df_frames["Date"].dt.strftime("%Y-%m-%d")
+    import plotly.express as px
+    return px.choropleth(
+        df_frames,
+        locations="Country/Region",
+        locationmode="country names",
+        color="Confirmed",
+        hover_name="Country/Region",
+        animation_frame="Day",
+        range_color=(0, df_frames["Confirmed"].max()),
+        color_continuous_scale="Reds",
+        title="Global COVID-19 Confirmed Cases Over Time"
+    )
+
+
+def heatmap_json(version, name, build):
+    key = (version, name)
+    with _lock:
+        if key in _json_cache:
+            record_cache("heatmap", True)
+            return _json_cache[key]
+
+    record_cache("heatmap", False)
+    body = pio.to_json(build(), validate=False)
+    with _lock:
+        # 只保留当前版本的 JSON
+        for old_key in [k for k in _json_cache if k[0] != version]:
+            del _json_cache[old_key]
+        return _json_cache.setdefault(key, body)
+
+
+def warm_heatmaps(version, get_grouped, get_latest):
+    # get_grouped() / get_latest() 返回 df_grouped / df_latest，只在需要生成图表时调用
+    # 加载数据时生成最新一天的热力图；动画版本较大，在后台线程里生成
+    heatmap_json(version, "latest", lambda: heatmap_figure(get_latest()))
+    threading.Thread(
+        target=heatmap_json,
+        args=(version, "animated", lambda: animated_heatmap_figure(get_grouped())),
+        daemon=True
+    ).start()
+
+
+def register_heatmap_routes(server, get_data):
+    # get_data() -> (数据集版本, get_grouped, get_latest)，含义同 warm_heatmaps
+    def json_response(version, body):
+        response = Response(body, mimetype="application/json")
+        response.set_etag(version)
+        # 浏览器每次用 ETag 校验，数据没变时返回 304
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    @server.route(HEATMAP_URL)
+    def serve_heatmap():
+        version, get_grouped, get_latest = get_data()
+        return json_response(version, heatmap_json(version, "latest", lambda: heatmap_figure(get_latest())))
+
+    @server.route(ANIMATED_HEATMAP_URL)
+    def serve_animated_heatmap():
+        version, get_grouped, get_latest = get_data()
+        body = heatmap_json(version, "animated", lambda: animated_heatmap_figure(get_grouped()))
+        return json_response(version, body)
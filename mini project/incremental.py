@@ -0,0 +1,164 @@
+import json
+import os
+import sys
+import pandas as pd
+from storage import load_table, save_table, table_path, data_folder
+from aggregate import sum_by_country, diff_by_date, wide_to_long, ID_VARS, DATE_FORMAT
+
+# -----------------------------------
+# 增量导入：JHU 宽表每天只多一列日期
+# manifest.json 记录已经物化的日期列和每个国家历史数据的哈希，
+# 只对新增日期做 melt / 聚合 / diff 并追加；历史单元格被修订的国家整段重算。
+# 用法：python incremental.py [--full]
+# -----------------------------------
+SOURCES = {
+    "Confirmed": "time_series_covid19_confirmed_global.csv",
+    "Deaths": "time_series_covid19_deaths_global.csv",
+    "Recovered": "time_series_covid19_recovered_global.csv",
+}
+LONG_TABLES = {
+    "Confirmed": "converted_confirmed_data",
+    "Deaths": "converted_deaths_data",
+    "Recovered": "converted_recovered_data",
+}
+GLOBAL_TABLE = "global_covid19_dataset"
+
+manifest_path = os.path.join(data_folder, "manifest.json")
+
+
+def load_manifest():
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    # 表文件被全量脚本（data_parse.py / generate_golobal_data.py）重写过，manifest 就作废
+    for name, mtime in manifest.get("tables", {}).items():
+        path = table_path(name)
+        if not os.path.exists(path) or os.stat(path).st_mtime_ns != mtime:
+            return {}
+    return manifest
+
+
+def save_manifest(manifest):
+    manifest["tables"] = {
+        name: os.stat(table_path(name)).st_mtime_ns
+        for name in list(LONG_TABLES.values()) + [GLOBAL_TABLE]
+    }
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def row_hashes(agg):
+    if agg.shape[1] == 0:
+        return {}
+    return {c: str(h) for c, h in pd.util.hash_pandas_object(agg, index=False).items()}
+
+
+def scan_source(metric, entry):
+    # 读取宽表并按国家在宽表上求和（~290 行），判断新增列和被修订的国家
+    wide = pd.read_csv(os.path.join(data_folder, SOURCES[metric]))
+    date_columns = [c for c in wide.columns if c not in ID_VARS]
+    agg = sum_by_country(wide)
+
+    done = entry.get("columns", [])
+    # 旧列被删除或重排时 manifest 作废，由 ingest 整表重算
+    reset = done != date_columns[:len(done)]
+    if reset:
+        done = []
+    old_hashes = entry.get("hashes", {}) if done else {}
+    hashes = row_hashes(agg[done])
+
+    revised = {c for c in agg.index if old_hashes.get(c) != hashes.get(c)}
+    removed = set(old_hashes) - set(agg.index)
+    return {
+        "wide": wide,
+        "agg": agg,
+        "date_columns": date_columns,
+        "new_columns": date_columns[len(done):],
+        "prev_column": done[-1] if done else None,
+        "affected": revised | removed,
+        "reset": reset,
+    }
+
+
+def global_delta(scans, affected):
+    full_frames = {}
+    rest_frames = {}
+    for metric, scan in scans.items():
+        agg = scan["agg"]
+        is_affected = agg.index.isin(affected)
+
+        # 受影响的国家：整段序列重算
+        full = agg.loc[is_affected]
+        full_frames[metric] = full
+        full_frames[f"New_{metric}"] = diff_by_date(full)
+
+        # 其余国家：只算新增日期，diff 需要带上前一天
+        new_columns = scan["new_columns"]
+        if scan["prev_column"] is not None and new_columns:
+            rest = agg.loc[~is_affected, [scan["prev_column"]] + new_columns]
+            rest_frames[metric] = rest[new_columns]
+            rest_frames[f"New_{metric}"] = diff_by_date(rest)[new_columns]
+
+    parts = [wide_to_long(frames) for frames in (full_frames, rest_frames) if frames]
+    df_delta = pd.concat(parts, ignore_index=True)
+    # 与 groupby().diff().fillna(0) 一致：第一天和缺失值处的新增记为 0
+    new_columns = [c for c in df_delta.columns if c.startswith("New_")]
+    df_delta[new_columns] = df_delta[new_columns].fillna(0)
+    return df_delta
+
+
+def long_delta(metric, scan, affected):
+    wide = scan["wide"]
+    is_affected = wide["Country/Region"].isin(affected)
+    parts = [wide.loc[is_affected].melt(id_vars=ID_VARS, value_vars=scan["date_columns"], var_name="Date", value_name=metric)]
+    if scan["new_columns"]:
+        parts.append(wide.loc[~is_affected].melt(id_vars=ID_VARS, value_vars=scan["new_columns"], var_name="Date", value_name=metric))
+    df_long = pd.concat(parts, ignore_index=True)
+    df_long["Date"] = pd.to_datetime(df_long["Date"], format=DATE_FORMAT)
+    return df_long
+
+
+def append_table(name, delta, affected, fresh):
+    if fresh:
+        combined = delta
+    else:
+        existing = load_table(name)
+        existing = existing[~existing["Country/Region"].isin(affected)]
+        combined = pd.concat([existing.astype({"Country/Region": object}), delta], ignore_index=True)
+    save_table(combined, name)
+
+
+def ingest(full=False):
+    manifest = {} if full else load_manifest()
+
+    scans = {metric: scan_source(metric, manifest.get(metric, {})) for metric in SOURCES}
+    # 没有 manifest 或任一宽表的旧列被删除/重排：所有国家重算，表整体替换而不是追加
+    fresh = not manifest or any(scan["reset"] for scan in scans.values())
+    # 任一指标被修订的国家，三个指标一起重算，保证合并表里同一国家的行是一致的
+    affected = set().union(*(scan["affected"] for scan in scans.values()))
+    if fresh:
+        affected = set().union(*(set(scan["agg"].index) for scan in scans.values()))
+
+    n_new = {metric: len(scan["new_columns"]) for metric, scan in scans.items()}
+    print(f"新增日期列: {n_new}，需要重算的国家: {len(affected)}")
+    if not affected and not any(n_new.values()):
+        print("数据没有变化。")
+        return
+
+    for metric, scan in scans.items():
+        append_table(LONG_TABLES[metric], long_delta(metric, scan, affected), affected, fresh)
+
+    append_table(GLOBAL_TABLE, global_delta(scans, affected), affected, fresh)
+
+    for metric, scan in scans.items():
+        manifest[metric] = {"columns": scan["date_columns"], "hashes": row_hashes(scan["agg"])}
+    save_manifest(manifest)
+    print(f"全局数据集已更新: '{table_path(GLOBAL_TABLE)}'")
+
+
+if __name__ == '__main__':
+    ingest(full="--full" in sys.argv)
@@ -0,0 +1,308 @@
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from dash.exceptions import PreventUpdate
+from flask import Response, g, has_request_context, request
+
+# -----------------------------------
+# Dash 回调的延迟和负载统计，以 Prometheus 文本格式在 /metrics 上提供
+# instrument_callbacks(app) 包装之后注册的每个 @app.callback，记录墙钟时间、CPU 时间、调用结果，
+# 回调期间的缓存命中/未命中和上游 HTTP 耗时（figure_cache、heatmap、disease_client 通过
+# record_cache / record_upstream 上报），以及 /_dash-update-component 响应的字节数（压缩前）。
+# 每次观测只是在锁内给几个计数加一，可以在生产环境常开。
+#
+# 统计保存在各自的进程里。gunicorn 有多个 worker 时设置 METRICS_MULTIPROC_DIR（gunicorn.conf.py 默认设置）：
+# 每个 worker 每隔 FLUSH_INTERVAL 秒把自己的统计写到 <目录>/<pid>.json，
+# /metrics 合并目录下所有文件，无论请求落到哪个 worker，返回的都是所有 worker 的总和。
+# -----------------------------------
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20)
+
+multiproc_dir = os.environ.get("METRICS_MULTIPROC_DIR")
+FLUSH_INTERVAL = 5
+ARCHIVE = "archived.json"
+
+_lock = threading.Lock()
+_registry = []
+_flusher_pid = None
+# 当前回调的统计；disease_client 在线程池里请求时通过 contextvars.copy_context() 传递
+_current = contextvars.ContextVar("callback_stats", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = {}
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+    def snapshot(self):
+        with _lock:
+            return dict(self.series)
+
+    @staticmethod
+    def combine(total, value):
+        return value if total is None else total + value
+
+    def render(self, series):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(series.items()):
+            lines.append(f"{self.name}{_label_text(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        # labels -> [每个桶的计数..., +Inf 桶的计数, 总和]
+        self.series = {}
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        position = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            counts = self.series.get(key)
+            if counts is None:
+                counts = self.series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[position] += 1
+            counts[-1] += value
+
+    def snapshot(self):
+        with _lock:
+            return {key: list(counts) for key, counts in self.series.items()}
+
+    @staticmethod
+    def combine(total, counts):
+        return list(counts) if total is None else [a + b for a, b in zip(total, counts)]
+
+    def render(self, series):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, counts in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(key)} {counts[-1]}")
+            lines.append(f"{self.name}_count{_label_text(key)} {cumulative}")
+        return lines
+
+
+CALLBACK_SECONDS = Histogram("dash_callback_seconds", "Wall time of Dash callbacks.")
+CALLBACK_CPU_SECONDS = Histogram("dash_callback_cpu_seconds", "CPU time of Dash callbacks (calling thread).")
+CALLBACK_UPSTREAM_SECONDS = Histogram("dash_callback_upstream_seconds", "Upstream HTTP time spent inside Dash callbacks.")
+CALLBACK_PAYLOAD_BYTES = Histogram("dash_callback_payload_bytes", "Uncompressed response size of Dash callbacks.", BYTES_BUCKETS)
+CALLBACK_CALLS = Counter("dash_callback_calls_total", "Dash callback invocations by result.")
+CALLBACK_CACHE = Counter("dash_callback_cache_total", "Cache lookups made inside Dash callbacks.")
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result.")
+CACHE_ERRORS = Counter("cache_errors_total", "Cache backend errors by cache and operation.")
+UPSTREAM_SECONDS = Histogram("upstream_request_seconds", "Upstream HTTP request time by service.")
+
+
+def record_cache(cache, hit):
+    result = "hit" if hit else "miss"
+    CACHE_REQUESTS.inc(cache=cache, result=result)
+    stats = _current.get()
+    if stats is not None:
+        stats["cache"].append((cache, result))
+
+
+def record_cache_error(cache, operation):
+    CACHE_ERRORS.inc(cache=cache, operation=operation)
+
+
+def record_upstream(service, seconds, status):
+    UPSTREAM_SECONDS.observe(seconds, service=service, status=str(status))
+    stats = _current.get()
+    if stats is not None:
+        stats["upstream"].append(seconds)
+
+
+def timed_callback(func):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = {"cache": [], "upstream": []}
+        token = _current.set(stats)
+        status = "ok"
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        except PreventUpdate:
+            status = "prevented"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            _current.reset(token)
+            CALLBACK_SECONDS.observe(time.perf_counter() - wall_start, callback=name)
+            CALLBACK_CPU_SECONDS.observe(time.thread_time() - cpu_start, callback=name)
+            CALLBACK_CALLS.inc(callback=name, status=status)
+            if stats["upstream"]:
+                CALLBACK_UPSTREAM_SECONDS.observe(sum(stats["upstream"]), callback=name)
+            for cache, result in stats["cache"]:
+                CALLBACK_CACHE.inc(callback=name, cache=cache, result=result)
+            if has_request_context():
+                g.dash_callback = name
+
+    return wrapper
+
+
+def instrument_callbacks(app):
+    # 在声明回调之前调用；之后的 @app.callback 都会先经过 timed_callback
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def wrap(func):
+            return decorator(timed_callback(func))
+        return wrap
+
+    app.callback = callback
+    register_metrics_route(app.server)
+    return app
+
+
+# -----------------------------------
+# 多进程合并
+# 文件内容：{指标名: [[[标签名, 值], ...], 计数或桶计数], ...}；worker 退出后 gunicorn 的 master
+# 用 mark_process_dead 把它的文件并入 archived.json，计数不会因为 worker 重启而回退
+# -----------------------------------
+def _dump(series_by_name, path):
+    data = {name: [[list(map(list, key)), value] for key, value in series.items()]
+            for name, series in series_by_name.items()}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {name: {tuple(map(tuple, key)): value for key, value in series} for name, series in data.items()}
+
+
+def _merge(total, series_by_name):
+    combine = {metric.name: metric.combine for metric in _registry}
+    for name, series in series_by_name.items():
+        if name not in combine:
+            continue
+        merged = total.setdefault(name, {})
+        for key, value in series.items():
+            merged[key] = combine[name](merged.get(key), value)
+    return total
+
+
+def flush(folder=None):
+    # 把本进程的统计写到 <目录>/<pid>.json
+    folder = folder or multiproc_dir
+    os.makedirs(folder, exist_ok=True)
+    _dump({metric.name: metric.snapshot() for metric in _registry}, os.path.join(folder, f"{os.getpid()}.json"))
+
+
+def flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError as e:
+            print(f"Metrics flush failed: {e}")
+
+
+def start_flusher():
+    # fork 之后线程不会被继承，按 pid 判断当前进程是否已经启动
+    global _flusher_pid
+    if multiproc_dir is None or _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=flush_loop, daemon=True).start()
+
+
+def collect(folder=None):
+    folder = folder or multiproc_dir
+    if folder is None:
+        return {metric.name: metric.snapshot() for metric in _registry}
+    flush(folder)
+    total = {}
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".json"):
+            _merge(total, _load(os.path.join(folder, name)))
+    return total
+
+
+def mark_process_dead(pid, folder=None):
+    # 在 gunicorn 的 child_exit 里调用（master 进程）
+    folder = folder or multiproc_dir
+    if folder is None:
+        return
+    path = os.path.join(folder, f"{pid}.json")
+    if not os.path.exists(path):
+        return
+    archive = os.path.join(folder, ARCHIVE)
+    _dump(_merge(_load(archive), _load(path)), archive)
+    os.remove(path)
+
+
+def reset_multiproc_dir(folder=None):
+    # gunicorn 启动时清空上一次运行留下的文件
+    folder = folder or multiproc_dir
+    if folder is None:
+        return
+    os.makedirs(folder, exist_ok=True)
+    for name in os.listdir(folder):
+        if name.endswith(".json") or name.endswith(".tmp"):
+            os.remove(os.path.join(folder, name))
+
+
+def render(folder=None):
+    series_by_name = collect(folder)
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render(series_by_name.get(metric.name, {})))
+    return "\n".join(lines) + "\n"
+
+
+def register_metrics_route(server):
+    @server.after_request
+    def record_payload(response):
+        start_flusher()
+        name = g.get("dash_callback")
+        if name is not None and request.path.endswith("_dash-update-component") and not response.direct_passthrough:
+            CALLBACK_PAYLOAD_BYTES.observe(len(response.get_data()), callback=name)
+        return response
+
+    @server.route("/metrics")
+    def serve_metrics():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
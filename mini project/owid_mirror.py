@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+import pandas as pd
+import requests
+from metrics import record_upstream
+
+# -----------------------------------
+# OWID 数据本地镜像
+# 后台线程定期用条件请求（ETag / If-Modified-Since）刷新 owid-covid-data.csv，
+# 只把每个国家最新一行的几个字段存成 dataset/owid/latest.json，查询时按小写国家名 O(1) 查找。
+# OWID_SOURCE 可以指向本地 CSV 文件，这样完全离线也能使用。
+# -----------------------------------
+OWID_URL = "https://covid.ourworldindata.org/data/owid-covid-data.csv"
+OWID_COLUMNS = ["location", "date", "total_cases", "total_deaths", "population"]
+
+mirror_folder = os.path.join("dataset", "owid")
+index_path = os.path.join(mirror_folder, "latest.json")
+meta_path = os.path.join(mirror_folder, "meta.json")
+
+_lock = threading.Lock()
+_index = {"mtime": None, "rows": {}}
+_refresher = None
+
+
+def owid_source():
+    return os.environ.get("OWID_SOURCE", OWID_URL)
+
+
+def read_json(path, default):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), allow_nan=False)
+    os.replace(tmp_path, path)
+
+
+def download(source, meta):
+    # 返回 (本地 CSV 路径, 新的 meta)；数据没有变化时返回 (None, meta)
+    if os.path.exists(source):
+        mtime = os.stat(source).st_mtime_ns
+        if meta.get("source") == source and meta.get("mtime") == mtime:
+            return None, meta
+        return source, {"source": source, "mtime": mtime}
+
+    headers = {}
+    if meta.get("source") == source:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    start = time.perf_counter()
+    with requests.get(source, headers=headers, stream=True, timeout=(5, 120)) as r:
+        if r.status_code == 304:
+            record_upstream("owid", time.perf_counter() - start, r.status_code)
+            return None, meta
+        r.raise_for_status()
+        tmp_path = os.path.join(mirror_folder, f"owid-covid-data.{os.getpid()}.csv")
+        with open(tmp_path, "wb") as f:
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        record_upstream("owid", time.perf_counter() - start, r.status_code)
+        return tmp_path, {
+            "source": source,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+
+
+def build_index(csv_path):
+    df = pd.read_csv(csv_path, usecols=OWID_COLUMNS)
+    df = df.sort_values("date").groupby("location").last().reset_index()
+    # 缺失值写成 null（NaN 不是合法的 JSON）
+    df = df.astype(object).where(df.notna(), None)
+    rows = {}
+    for record in df.to_dict("records"):
+        rows[record["location"].lower()] = record
+    return rows
+
+
+def refresh():
+    if not os.path.exists(mirror_folder):
+        os.makedirs(mirror_folder, exist_ok=True)
+
+    source = owid_source()
+    # latest.json 不存在（例如被删除）时忽略 meta，重新下载并生成索引
+    meta = read_json(meta_path, {}) if os.path.exists(index_path) else {}
+    csv_path, new_meta = download(source, meta)
+    if csv_path is None:
+        return False
+
+    try:
+        write_json(index_path, build_index(csv_path))
+    finally:
+        if csv_path != source:
+            os.remove(csv_path)
+    write_json(meta_path, new_meta)
+    return True
+
+
+def load_index():
+    # latest.json 被其它进程刷新后重新加载
+    try:
+        mtime = os.stat(index_path).st_mtime_ns
+    except OSError:
+        return {}
+    with _lock:
+        if _index["mtime"] != mtime:
+            _index["rows"] = read_json(index_path, {})
+            _index["mtime"] = mtime
+        return _index["rows"]
+
+
+def lookup(country_name):
+    return load_index().get(country_name.strip().lower())
+
+
+def is_ready():
+    return os.path.exists(index_path)
+
+
+def refresh_loop(interval):
+    while True:
+        try:
+            if refresh():
+                print("OWID mirror updated.")
+        except Exception as e:
+            print(f"Error refreshing OWID mirror: {e}")
+        time.sleep(interval)
+
+
+def start_background_refresh(interval=6 * 3600):
+    global _refresher
+    with _lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=refresh_loop, args=(interval,), daemon=True)
+            _refresher.start()
+
+
+if __name__ == '__main__':
+    # 手动刷新一次镜像：python owid_mirror.py
+    print("updated" if refresh() else "not modified")
@@ -0,0 +1,264 @@
+import dash
+import dash_bootstrap_components as dbc
+import pandas as pd
+from dash import dcc, html, Input, Output, State, dash_table
+import plotly.graph_objs as go
+from dash_app import app, snapshot, country_options
+from daily_table import TABLE_COLUMNS, table_page
+from figure_transport import epoch_ms
+
+# -----------------------------------
+# Daily Info 页面（/dailyinfo）
+# -----------------------------------
+
+
+def layout():
+    version, cube = snapshot()
+    return dbc.Container([
+        dbc.Row(
+            dbc.Col(html.H1("Daily COVID-19 Detailed Information", className="text-center text-primary mb-4"), width=12)
+        ),
+        dbc.Row(
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader("Select Country"),
+                    dbc.CardBody([
+                        dcc.Dropdown(
+                            id="daily-info-country-dropdown",
+                            options=country_options(cube),
+                            value="US",
+                            multi=False,
+                            style={"font-size": "16px"}
+                        ),
+                  
+                        dcc.Interval(id="interval-summary", interval=60000, n_intervals=0),
+                        dcc.Store(id="daily-info-dataset-version", data=version)
+                    ])
+                ], className="mb-4", outline=True, color="secondary"),
+                md=6, className="mb-4"
+            )
+        ),
+        dbc.Row(
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader("Daily Data"),
+                    dbc.CardBody([
+                        dbc.Row([
+                            dbc.Col(dcc.Dropdown(
+                                id="daily-info-table-countries",
+                                options=country_options(cube),
+                                value=["US"],
+                                multi=True,
+                                placeholder="All countries"
+                            ), md=8),
+                            dbc.Col(dcc.DatePickerRange(
+                                id="daily-info-date-range",
+                                min_date_allowed=cube.start_date,
+                                max_date_allowed=cube.end_date,
+                                start_date=cube.end_date - pd.Timedelta(days=30),
+                                end_date=cube.end_date,
+                                display_format="YYYY-MM-DD"
+                            ), md=4)
+                        ], className="mb-3"),
+                        dash_table.DataTable(
+                            id="daily-info-table",
+                            columns=TABLE_COLUMNS,
+                            data=[],
+                            # 分页、排序和筛选都在服务端完成，见 daily_table.py
+                            page_action="custom",
+                            page_current=0,
+                            sort_action="custom",
+                            sort_mode="multi",
+                            sort_by=[],
+                            filter_action="custom",
+                            filter_query="",
+                            style_cell={'textAlign': 'center', 'fontSize': '14px'},
+                            style_header={
+                                'backgroundColor': 'rgb(230, 230, 230)',
+                                'fontWeight': 'bold'
+                            },
+                            page_size=10,
+                            style_table={'overflowX': 'auto'}
+                        )
+                    ])
+                ], className="mb-4", outline=True, color="light"),
+                width=12
+            )
+        ),
+        dbc.Row([
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader("Real-Time Country Summary"),
+                    dbc.CardBody([
+                        dcc.Graph(id="real-time-summary-graph")
+                    ])
+                ], className="mb-4", outline=True, color="light"),
+                md=6
+            ),
+            dbc.Col(
+                dbc.Card([
+                    dbc.CardHeader("New Cases Trend (Last 7 Days)"),
+                    dbc.CardBody([
+                        dcc.Graph(id="daily-info-bar-chart")
+                    ])
+                ], className="mb-4", outline=True, color="light"),
+                md=6
+            )
+        ])
+    ], fluid=True, style={"backgroundColor": "#f7f7f7", "padding": "20px"})
+
+
+# -----------------------------------
+# Daily Info 表格更新回调（默认最近 30 天，可选多个国家和任意日期窗口）
+# 表格按页从服务端取数据，只发送当前一页
+# -----------------------------------
+@app.callback(
+    [Output("daily-info-country-dropdown", "options"),
+     Output("daily-info-table-countries", "options"),
+     Output("daily-info-date-range", "min_date_allowed"),
+     Output("daily-info-date-range", "max_date_allowed"),
+     Output("daily-info-date-range", "end_date"),
+     Output("daily-info-dataset-version", "data")],
+    Input("interval-summary", "n_intervals"),
+    [State("daily-info-dataset-version", "data"),
+     State("daily-info-date-range", "end_date"),
+     State("daily-info-date-range", "max_date_allowed")]
+)
+def refresh_daily_info_controls(n, shown_version, end_date, max_date):
+    version, cube = snapshot()
+    if version == shown_version:
+        raise dash.exceptions.PreventUpdate
+    if not end_date or not max_date or pd.Timestamp(end_date) >= pd.Timestamp(max_date):
+        end_date = cube.end_date
+    options = country_options(cube)
+    return options, options, cube.start_date, cube.end_date, end_date, version
+
+
+@app.callback(
+    Output("daily-info-table-countries", "value"),
+    Input("daily-info-country-dropdown", "value")
+)
+def follow_selected_country(selected_country):
+    # 表格默认跟随上方选中的国家，之后可以再添加其它国家
+    if not selected_country:
+        raise dash.exceptions.PreventUpdate
+    return [selected_country]
+
+
+@app.callback(
+    [Output("daily-info-table", "data"),
+     Output("daily-info-table", "page_count"),
+     Output("daily-info-table", "page_current")],
+    [Input("daily-info-table-countries", "value"),
+     Input("daily-info-date-range", "start_date"),
+     Input("daily-info-date-range", "end_date"),
+     Input("daily-info-table", "page_current"),
+     Input("daily-info-table", "page_size"),
+     Input("daily-info-table", "sort_by"),
+     Input("daily-info-table", "filter_query"),
+     Input("daily-info-dataset-version", "data")]
+)
+def update_daily_info(selected_countries, start_date, end_date, page_current, page_size, sort_by, filter_query,
+                      shown_version):
+    version, cube = snapshot()
+    # 没有选国家时显示全部国家
+    df_daily = cube.frame(countries=selected_countries or None, days=cube.day_slice(start_date, end_date))
+    return table_page(df_daily, filter_query, sort_by, page_current, page_size or 10)
+
+# -----------------------------------
+# 实时国家摘要和右侧条形图更新回调
+# 使用 disease.sh API 调用实时数据获取国家实时摘要，每 60 秒更新；右侧条形图调用 disease.sh 历史接口获取过去 7 天数据
+# 请求通过 disease_client 发出（连接池、并发、TTL 缓存）；requests 和 plotly.express 在第一次调用时才导入
+# -----------------------------------
+@app.callback(
+    [Output("real-time-summary-graph", "figure"),
+     Output("daily-info-bar-chart", "figure")],
+    [Input("daily-info-country-dropdown", "value"),
+     Input("interval-summary", "n_intervals")]
+)
+def update_real_time_summary_and_bar(selected_country, n):
+    import disease_client
+    import plotly.express as px
+    if not selected_country:
+        return go.Figure(), go.Figure()
+                         
+    # 摘要和历史数据并发获取，相同请求在 TTL 内直接命中缓存
+    summary_request, hist_request = disease_client.fetch_country(selected_country, lastdays=8)
+    try:
+        status, data = summary_request.result()
+        if status != 200:
+            summary_fig = go.Figure(data=[go.Indicator(
+                mode="number",
+                value=0,
+                title={"text": f"Error fetching data for {selected_country}"}
+            )])
+        else:
+            summary_df = pd.DataFrame({
+                "Metric": ["Total Cases", "Active", "Deaths", "Recovered", "Critical"],
+                "Value": [data.get("cases", 0), data.get("active", 0), data.get("deaths", 0), data.get("recovered", 0), data.get("critical", 0)]
+            })
+            summary_fig = px.bar(summary_df, x="Metric", y="Value", text="Value",
+                                 title=f"Real-Time Summary for {selected_country}")
+            summary_fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            summary_fig.update_layout(yaxis_tickformat=",")
+    except Exception as e:
+        summary_fig = go.Figure(data=[go.Indicator(
+            mode="number",
+            value=0,
+            title={"text": f"Error: {str(e)}"}
+        )])
+    
+
+    try:
+        hist_status, hist_data = hist_request.result()
+        if hist_status != 200:
+            new_bar_fig = go.Figure()
+        else:
+            timeline = hist_data.get("timeline", {})
+            cases = timeline.get("cases", {})
+            deaths = timeline.get("deaths", {})
+            recovered = timeline.get("recovered", {})
+      
+            df_hist = pd.DataFrame({
+                "Date": pd.to_datetime(list(cases.keys()), format="%m/%d/%y"),
+                "Confirmed": list(cases.values()),
+                "Deaths": list(deaths.values()),
+                "Recovered": list(recovered.values())
+            }).sort_values("Date")
+            if df_hist.shape[0] < 2:
+                new_bar_fig = go.Figure()
+            else:
+       
+                df_hist["New_Confirmed"] = df_hist["Confirmed"].diff().fillna(df_hist["Confirmed"])
+                df_hist["New_Deaths"] = df_hist["Deaths"].diff().fillna(df_hist["Deaths"])
+                df_hist["New_Recovered"] = df_hist["Recovered"].diff().fillna(df_hist["Recovered"])
+         
+                df_recent = df_hist.iloc[-7:]
+                new_bar_fig = go.Figure()
+                new_bar_fig.add_trace(go.Bar(
+                    x=epoch_ms(df_recent["Date"]),
+                    y=df_recent["New_Confirmed"],
+                    name="New Confirmed"
+                ))
+                new_bar_fig.add_trace(go.Bar(
+                    x=epoch_ms(df_recent["Date"]),
+                    y=df_recent["New_Deaths"],
+                    name="New Deaths"
+                ))
+                new_bar_fig.add_trace(go.Bar(
+                    x=epoch_ms(df_recent["Date"]),
+                    y=df_recent["New_Recovered"],
+                    name="New Recovered"
+                ))
+                new_bar_fig.update_layout(
+                    title=f"{selected_country} New Cases Trend (Last 7 Days)",
+                    xaxis_title="Date",
+                    xaxis_type="date",
+                    yaxis_title="Daily New Count",
+                    barmode="group",
+                    template="plotly_white"
+                )
+    except Exception as e:
+        new_bar_fig = go.Figure()
+    
+    return summary_fig, new_bar_fig
@@ -0,0 +1,334 @@
+import os
+import dash
+import dash_bootstrap_components as dbc
+import pandas as pd
+from dash import dcc, html, Input, Output, State
+import plotly.graph_objs as go
+from cube import METRICS, NEW_METRICS
+from dash_app import app, snapshot, country_options, RELOAD_CHECK_MS
+from derived import METRIC_LABELS
+from downsample import downsample_series
+from figure_transport import epoch_ms
+from figure_cache import FigureCache, figure_key
+from series_api import SERIES_FETCH_JS, SERIES_FIGURES_JS
+
+# -----------------------------------
+# Global Dashboard 页面（/global）
+# -----------------------------------
+# 图表缓存；设置 FIGURE_CACHE_DIR 后多个 gunicorn worker 通过该目录共享缓存
+figure_cache = FigureCache(max_entries=128, folder=os.environ.get("FIGURE_CACHE_DIR"))
+
+
+def layout():
+    version, cube = snapshot()
+    return dbc.Container([
+        dbc.Row(
+            dbc.Col(html.H2("Global COVID-19 Data Dashboard", className="text-center mb-4"), width=12)
+        ),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Countries:", className="font-weight-bold"),
+                dcc.Dropdown(
+                    id="country-dropdown",
+                    options=country_options(cube),
+                    value=["US", "India", "Italy"],
+                    multi=True,
+                    style={"font-size": "16px"}
+                )
+            ], md=6),
+            dbc.Col([
+                html.Label("Select Date Range:", className="font-weight-bold"),
+                dcc.DatePickerRange(
+                    id="date-picker-range",
+                    min_date_allowed=cube.start_date,
+                    max_date_allowed=cube.end_date,
+                    start_date=cube.start_date,
+                    end_date=cube.end_date,
+                    display_format="YYYY-MM-DD"
+                )
+            ], md=6)
+        ], className="mb-4"),
+        dbc.Row(dbc.Col(dcc.RadioItems(
+            id="global-render-mode",
+            options=[
+                {"label": " Render on server", "value": "server"},
+                {"label": " Filter in browser", "value": "client"}
+            ],
+            value="server",
+            inline=True,
+            inputStyle={"marginLeft": "15px"}
+        ), width=12), className="mb-2"),
+        dcc.Interval(id="global-reload-interval", interval=RELOAD_CHECK_MS, n_intervals=0),
+        dcc.Store(id="global-dataset-version", data=version),
+        dcc.Store(id="global-graph-width"),
+        dcc.Store(id="global-series-store"),
+        dcc.Store(id="global-figure-layouts"),
+        dbc.Row(dbc.Col(dcc.Graph(id="cumulative-graph"), width=12)),
+        dbc.Row(dbc.Col(dcc.Graph(id="daily-new-graph"), width=12)),
+        dbc.Row(dbc.Col([
+            html.Label("Select Metric:", className="font-weight-bold"),
+            dcc.Dropdown(
+                id="global-metric-picker",
+                options=[{"label": label, "value": metric} for metric, label in METRIC_LABELS.items()],
+                value="New_Confirmed_7d",
+                clearable=False
+            )
+        ], md=6), className="mt-4"),
+        dbc.Row(dbc.Col(dcc.Graph(id="metric-graph"), width=12))
+    ], fluid=True, style={"backgroundColor": "#f7f7f7", "padding": "20px"})
+
+
+# -----------------------------------
+# Global Dashboard 图表更新回调
+# 数据集切换到新版本时先刷新国家列表和日期范围，再由版本号触发图表重新生成；
+# 版本号在 layout() 里写入，打开页面时第一次检查不会改变它，图表只生成一次
+# -----------------------------------
+@app.callback(
+    [Output("country-dropdown", "options"),
+     Output("date-picker-range", "min_date_allowed"),
+     Output("date-picker-range", "max_date_allowed"),
+     Output("date-picker-range", "end_date"),
+     Output("global-dataset-version", "data")],
+    Input("global-reload-interval", "n_intervals"),
+    [State("global-dataset-version", "data"),
+     State("date-picker-range", "end_date"),
+     State("date-picker-range", "max_date_allowed")]
+)
+def refresh_global_controls(n, shown_version, end_date, max_date):
+    version, cube = snapshot()
+    if version == shown_version:
+        raise dash.exceptions.PreventUpdate
+    # 结束日期停在旧数据最后一天时跟随到新的最后一天，用户选的其它日期保持不变
+    if not end_date or not max_date or pd.Timestamp(end_date) >= pd.Timestamp(max_date):
+        end_date = cube.end_date
+    return country_options(cube), cube.start_date, cube.end_date, end_date, version
+
+
+# 图表宽度决定降采样的目标点数
+app.clientside_callback(
+    "function(n) { return window.innerWidth; }",
+    Output("global-graph-width", "data"),
+    Input("global-reload-interval", "n_intervals")
+)
+
+
+@app.callback(
+    [Output("cumulative-graph", "figure"),
+     Output("daily-new-graph", "figure")],
+    [Input("country-dropdown", "value"),
+     Input("date-picker-range", "start_date"),
+     Input("date-picker-range", "end_date"),
+     Input("global-dataset-version", "data"),
+     Input("cumulative-graph", "relayoutData"),
+     Input("daily-new-graph", "relayoutData"),
+     Input("global-render-mode", "value")],
+    State("global-graph-width", "data")
+)
+def update_global_graphs(selected_countries, start_date, end_date, shown_version,
+                         cum_relayout, daily_relayout, mode, graph_width):
+    return global_graphs(dash.callback_context.triggered_id, selected_countries, start_date, end_date,
+                         cum_relayout, daily_relayout, mode, graph_width)
+
+
+def global_graphs(triggered, selected_countries, start_date, end_date, cum_relayout, daily_relayout, mode,
+                  graph_width):
+    # triggered: 触发回调的组件 id；不依赖 callback_context，基准测试可以直接调用
+    if mode == "client":
+        # 浏览器端模式下由下面的 clientside callback 生成图表
+        raise dash.exceptions.PreventUpdate
+    version, cube = snapshot()
+    if not selected_countries:
+        selected_countries = []
+    selected_countries = [c for c in selected_countries if c in cube.country_index]
+    # 国家和日期选择不变时保留用户当前的缩放状态
+    revision = str(figure_key(selected_countries, start_date, end_date))
+
+    # 缩放/平移时只重新取可见范围内的数据；范围内天数不超过目标点数时就是完整分辨率
+    if triggered in ("cumulative-graph", "daily-new-graph"):
+        window = zoom_window(cum_relayout if triggered == "cumulative-graph" else daily_relayout)
+        if window is None:
+            raise dash.exceptions.PreventUpdate
+        if window != "autorange":
+            start_date = max(pd.Timestamp(start_date), window[0]) if start_date else window[0]
+            end_date = min(pd.Timestamp(end_date), window[1]) if end_date else window[1]
+
+    # 每条曲线保留约每 4 像素一个点
+    n_points = min(max(int(graph_width or 1200) // 4, 100), 2000)
+    # 相同的国家集合和日期范围直接返回缓存的图表，国家按名称排序
+    key = figure_key(selected_countries, start_date, end_date) + (n_points,)
+    figures = figure_cache.get_or_build(version, key, lambda: build_global_figures(cube, *key))
+    return tuple({**fig, "layout": {**fig["layout"], "uirevision": revision}} for fig in figures)
+
+
+def zoom_window(relayout):
+    # relayoutData -> (开始, 结束) / "autorange" / None（与 x 轴无关的事件）
+    if not relayout:
+        return None
+    if relayout.get("xaxis.autorange"):
+        return "autorange"
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        start, end = relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    elif "xaxis.range" in relayout:
+        start, end = relayout["xaxis.range"]
+    else:
+        return None
+    return pd.Timestamp(start).floor("D"), pd.Timestamp(end).ceil("D")
+
+
+def build_global_figures(cube, selected_countries, start_date, end_date, n_points):
+    days = cube.day_slice(start_date, end_date)
+    # 日期用 epoch 毫秒传输，数值保持 numpy 数组，序列化为 base64 类型数组（见 figure_transport.py）
+    dates = epoch_ms(cube.dates[days])
+    # 每个国家一次字典查找得到六个指标的视图，再用 LTTB 降到 n_points 个点
+    series = [cube.series(country, days) for country in selected_countries]
+    sampled = downsample_series(dates, series, METRICS + NEW_METRICS, n_points)
+
+    fig_cum = go.Figure()
+    for country, data in zip(selected_countries, sampled):
+        fig_cum.add_trace(go.Scatter(
+            x=data["Confirmed"][0],
+            y=data["Confirmed"][1],
+            mode="lines+markers",
+            name=f"{country} Cumulative Confirmed"
+        ))
+        fig_cum.add_trace(go.Scatter(
+            x=data["Deaths"][0],
+            y=data["Deaths"][1],
+            mode="lines+markers",
+            name=f"{country} Cumulative Deaths"
+        ))
+        fig_cum.add_trace(go.Scatter(
+            x=data["Recovered"][0],
+            y=data["Recovered"][1],
+            mode="lines+markers",
+            name=f"{country} Cumulative Recovered"
+        ))
+    fig_cum.update_layout(
+        title="Cumulative Trends",
+        xaxis_title="Date",
+        xaxis_type="date",
+        yaxis_title="Cumulative Count",
+        template="plotly_white",
+        font=dict(size=12),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    fig_daily = go.Figure()
+    for country, data in zip(selected_countries, sampled):
+        fig_daily.add_trace(go.Scatter(
+            x=data["New_Confirmed"][0],
+            y=data["New_Confirmed"][1],
+            mode="lines+markers",
+            name=f"{country} New Confirmed"
+        ))
+        fig_daily.add_trace(go.Scatter(
+            x=data["New_Deaths"][0],
+            y=data["New_Deaths"][1],
+            mode="lines+markers",
+            name=f"{country} New Deaths"
+        ))
+        fig_daily.add_trace(go.Scatter(
+            x=data["New_Recovered"][0],
+            y=data["New_Recovered"][1],
+            mode="lines+markers",
+            name=f"{country} New Recovered"
+        ))
+    fig_daily.update_layout(
+        title="Daily New Trends",
+        xaxis_title="Date",
+        xaxis_type="date",
+        yaxis_title="Daily Count",
+        template="plotly_white",
+        font=dict(size=12),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig_cum.to_dict(), fig_daily.to_dict()
+
+
+# -----------------------------------
+# 指标选择：基础指标和预先算好的派生指标（滑动平均、每 10 万人、病死率、增长率、倍增时间，见 derived.py）
+# 回调只取 cube 里的视图并降采样，不在请求里计算；两种渲染模式下都由服务端生成
+# -----------------------------------
+@app.callback(
+    Output("metric-graph", "figure"),
+    [Input("country-dropdown", "value"),
+     Input("date-picker-range", "start_date"),
+     Input("date-picker-range", "end_date"),
+     Input("global-metric-picker", "value"),
+     Input("global-dataset-version", "data")],
+    State("global-graph-width", "data")
+)
+def update_metric_graph(selected_countries, start_date, end_date, metric, shown_version, graph_width):
+    version, cube = snapshot()
+    if metric not in METRIC_LABELS:
+        raise dash.exceptions.PreventUpdate
+    selected_countries = [c for c in selected_countries or [] if c in cube.country_index]
+    n_points = min(max(int(graph_width or 1200) // 4, 100), 2000)
+    key = figure_key(selected_countries, start_date, end_date) + (n_points, metric)
+    return figure_cache.get_or_build(version, key, lambda: build_metric_figure(cube, *key))
+
+
+def build_metric_figure(cube, selected_countries, start_date, end_date, n_points, metric):
+    days = cube.day_slice(start_date, end_date)
+    dates = epoch_ms(cube.dates[days])
+    series = [cube.series(country, days) for country in selected_countries]
+    sampled = downsample_series(dates, series, [metric], n_points)
+
+    fig = go.Figure()
+    for country, data in zip(selected_countries, sampled):
+        fig.add_trace(go.Scatter(
+            x=data[metric][0],
+            y=data[metric][1],
+            mode="lines",
+            name=country
+        ))
+    fig.update_layout(
+        title=METRIC_LABELS[metric],
+        xaxis_title="Date",
+        xaxis_type="date",
+        yaxis_title=METRIC_LABELS[metric],
+        template="plotly_white",
+        font=dict(size=12),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig.to_dict()
+
+
+# -----------------------------------
+# 浏览器端模式：每个国家的序列只取一次并缓存在 dcc.Store，日期范围变化不再请求服务器（见 series_api.py）
+# -----------------------------------
+@app.callback(
+    Output("global-figure-layouts", "data"),
+    Input("global-render-mode", "value"),
+    State("global-figure-layouts", "data")
+)
+def load_figure_layouts(mode, layouts):
+    # 两张图的 layout（含模板）只在第一次切换到浏览器端模式时发送一次
+    if mode != "client" or layouts:
+        raise dash.exceptions.PreventUpdate
+    version, cube = snapshot()
+    return [figure["layout"] for figure in build_global_figures(cube, [], None, None, 100)]
+
+
+app.clientside_callback(
+    SERIES_FETCH_JS,
+    Output("global-series-store", "data"),
+    [Input("country-dropdown", "value"),
+     Input("global-render-mode", "value"),
+     Input("global-dataset-version", "data")],
+    State("global-series-store", "data")
+)
+
+app.clientside_callback(
+    SERIES_FIGURES_JS,
+    [Output("cumulative-graph", "figure", allow_duplicate=True),
+     Output("daily-new-graph", "figure", allow_duplicate=True)],
+    [Input("global-series-store", "data"),
+     Input("country-dropdown", "value"),
+     Input("date-picker-range", "start_date"),
+     Input("date-picker-range", "end_date"),
+     Input("global-render-mode", "value"),
+     Input("global-figure-layouts", "data")],
+    prevent_initial_call=True
+)
@@ -0,0 +1,33 @@
+import dash_bootstrap_components as dbc
+from dash import dcc, html, Input, Output
+from dash_app import app
+from heatmap import HEATMAP_CLIENTSIDE_JS
+
+# -----------------------------------
+# Global heatmap 页面（/heatmap）: 预先生成的 JSON 由 /data/heatmap*.json 提供
+# -----------------------------------
+
+
+def layout():
+    return dbc.Container([
+        dbc.Row(dbc.Col(html.H2("Global COVID-19 Heatmap", className="text-center mb-4"), width=12)),
+        dbc.Row(dbc.Col(dcc.RadioItems(
+            id="heatmap-mode",
+            options=[
+                {"label": " Latest", "value": "latest"},
+                {"label": " Over time", "value": "animated"}
+            ],
+            value="latest",
+            inline=True,
+            inputStyle={"marginLeft": "15px"}
+        ), width=12), className="mb-2"),
+        dbc.Row(dbc.Col(dcc.Graph(id="global-heatmap"), width=12))
+    ], fluid=True)
+
+
+app.clientside_callback(
+    HEATMAP_CLIENTSIDE_JS,
+    Output("global-heatmap", "figure"),
+    [Input("url", "pathname"),
+     Input("heatmap-mode", "value")]
+)
@@ -0,0 +1,171 @@
+import dash
+import dash_bootstrap_components as dbc
+import numpy as np
+from dash import dcc, html, Input, Output, State
+import plotly.graph_objs as go
+from dash_app import app, snapshot, country_options, RELOAD_CHECK_MS
+from derived import METRIC_LABELS
+from ranking import RANK_METRICS
+
+# -----------------------------------
+# Top N 排行榜页面（/leaderboard）
+# 任意一天、任意排名指标的前 N 名直接从预先算好的排名索引读取（cube.top / cube.rank，见 ranking.py），
+# 播放时每一帧只是一次 O(N) 查询，所以可以按天做 bar chart race
+# -----------------------------------
+PLAY_INTERVAL_MS = 500
+PLAY_STEP_DAYS = 7
+
+
+def date_marks(dates):
+    # 每年一月一个刻度
+    return {int(i): f"{dates[i]:%Y}" for i in np.flatnonzero((dates.day == 1) & (dates.month == 1))}
+
+
+def layout():
+    version, cube = snapshot()
+    last = len(cube.dates) - 1
+    return dbc.Container([
+        dbc.Row(dbc.Col(html.H2("Top N Countries", className="text-center mb-4"), width=12)),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Metric:", className="font-weight-bold"),
+                dcc.Dropdown(
+                    id="leaderboard-metric",
+                    options=[{"label": METRIC_LABELS[metric], "value": metric} for metric in RANK_METRICS],
+                    value="Confirmed",
+                    clearable=False
+                )
+            ], md=4),
+            dbc.Col([
+                html.Label("Top N:", className="font-weight-bold"),
+                dcc.Dropdown(
+                    id="leaderboard-n",
+                    options=[{"label": str(n), "value": n} for n in (5, 10, 15, 20, 30)],
+                    value=10,
+                    clearable=False
+                )
+            ], md=2),
+            dbc.Col([
+                html.Label("Show Rank Of:", className="font-weight-bold"),
+                dcc.Dropdown(id="leaderboard-country", options=country_options(cube), value="US")
+            ], md=4),
+            dbc.Col(
+                dbc.Button("Play", id="leaderboard-play", color="primary", className="mt-4"),
+                md=2
+            )
+        ], className="mb-4"),
+        dbc.Row(dbc.Col([
+            html.Label(id="leaderboard-date-label", className="font-weight-bold"),
+            dcc.Slider(id="leaderboard-day", min=0, max=last, step=1, value=last,
+                       marks=date_marks(cube.dates), updatemode="drag")
+        ], width=12), className="mb-2"),
+        dcc.Interval(id="leaderboard-play-interval", interval=PLAY_INTERVAL_MS, disabled=True),
+        dcc.Interval(id="leaderboard-reload-interval", interval=RELOAD_CHECK_MS, n_intervals=0),
+        dcc.Store(id="leaderboard-dataset-version", data=version),
+        dbc.Row(dbc.Col(dcc.Graph(id="leaderboard-graph", style={"height": "600px"}), width=12))
+    ], fluid=True, style={"backgroundColor": "#f7f7f7", "padding": "20px"})
+
+
+# -----------------------------------
+# 数据集切换到新版本时延长日期滑块，停在最后一天的滑块跟随到新的最后一天
+# -----------------------------------
+@app.callback(
+    [Output("leaderboard-day", "max"),
+     Output("leaderboard-day", "marks"),
+     Output("leaderboard-day", "value"),
+     Output("leaderboard-country", "options"),
+     Output("leaderboard-dataset-version", "data")],
+    Input("leaderboard-reload-interval", "n_intervals"),
+    [State("leaderboard-dataset-version", "data"),
+     State("leaderboard-day", "value"),
+     State("leaderboard-day", "max")]
+)
+def refresh_leaderboard_controls(n, shown_version, day, last):
+    version, cube = snapshot()
+    if version == shown_version:
+        raise dash.exceptions.PreventUpdate
+    new_last = len(cube.dates) - 1
+    if day is None or last is None or day >= last:
+        day = new_last
+    return new_last, date_marks(cube.dates), min(day, new_last), country_options(cube), version
+
+
+@app.callback(
+    [Output("leaderboard-day", "value", allow_duplicate=True),
+     Output("leaderboard-play-interval", "disabled"),
+     Output("leaderboard-play", "children")],
+    [Input("leaderboard-play", "n_clicks"),
+     Input("leaderboard-play-interval", "n_intervals")],
+    [State("leaderboard-day", "value"),
+     State("leaderboard-day", "max"),
+     State("leaderboard-play-interval", "disabled")],
+    prevent_initial_call=True
+)
+def play_leaderboard(n_clicks, n_intervals, day, last, paused):
+    day = day or 0
+    if dash.callback_context.triggered_id == "leaderboard-play":
+        if not paused:
+            return dash.no_update, True, "Play"
+        # 已经在最后一天时从头播放
+        return (0 if day >= last else dash.no_update), False, "Pause"
+    if paused:
+        raise dash.exceptions.PreventUpdate
+    day = min(day + PLAY_STEP_DAYS, last)
+    if day >= last:
+        return day, True, "Play"
+    return day, False, "Pause"
+
+
+@app.callback(
+    [Output("leaderboard-graph", "figure"),
+     Output("leaderboard-date-label", "children")],
+    [Input("leaderboard-day", "value"),
+     Input("leaderboard-metric", "value"),
+     Input("leaderboard-n", "value"),
+     Input("leaderboard-country", "value"),
+     Input("leaderboard-dataset-version", "data")]
+)
+def update_leaderboard(day, metric, top_n, country, shown_version):
+    version, cube = snapshot()
+    if metric not in cube.rank_index:
+        raise dash.exceptions.PreventUpdate
+    date = cube.dates[-1] if day is None else cube.dates[min(max(day, 0), len(cube.dates) - 1)]
+    leaders = cube.top(metric, date, top_n or 10)
+    label = f"Date: {date:%Y-%m-%d}"
+    if country in cube.country_index:
+        rank = cube.rank(metric, country, date)
+        if rank is None:
+            label += f" | {country}: n/a"
+        else:
+            label += f" | {country}: #{rank} of {cube.ranked_count(metric, date)}"
+    return leaderboard_figure(leaders, country, METRIC_LABELS[metric], date), label
+
+
+def format_value(value):
+    if np.isnan(value):
+        return ""
+    return f"{value:,.0f}" if abs(value) >= 100 else f"{value:,.2f}"
+
+
+def leaderboard_figure(leaders, highlight, title, date):
+    # 第一名在最上面；选中的国家用不同颜色
+    names = [name for name, _ in leaders][::-1]
+    values = np.array([value for _, value in leaders][::-1], dtype=float)
+    fig = go.Figure(go.Bar(
+        x=values,
+        y=names,
+        orientation="h",
+        text=[format_value(value) for value in values],
+        textposition="outside",
+        marker_color=["#e74c3c" if name == highlight else "#2c3e50" for name in names]
+    ))
+    fig.update_layout(
+        title=f"{title} - Top {len(leaders)} on {date:%Y-%m-%d}",
+        xaxis_title=title,
+        template="plotly_white",
+        margin=dict(l=180),
+        # 播放时柱子平滑过渡
+        transition={"duration": PLAY_INTERVAL_MS // 2, "easing": "cubic-in-out"},
+        uirevision="leaderboard"
+    )
+    return fig
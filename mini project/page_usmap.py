@@ -0,0 +1,76 @@
+import dash
+import dash_bootstrap_components as dbc
+import numpy as np
+from dash import dcc, html, Input, Output, State
+from dash_app import app
+from us_counties import get_engine as get_county_engine
+from us_map import empty_map_figure, NO_DATA_MESSAGE
+
+# -----------------------------------
+# US 县级地图页面（/usmap）：第一次打开 /usmap 时加载县级数据，按日期和州在服务端生成地图
+# -----------------------------------
+
+
+def layout():
+    return dbc.Container([
+        dbc.Row(dbc.Col(html.H2("US COVID-19 County Map", className="text-center mb-4"), width=12)),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select States:", className="font-weight-bold"),
+                dcc.Dropdown(id="us-state-dropdown", options=[], value=[], multi=True, placeholder="All states")
+            ], md=4),
+            dbc.Col([
+                html.Label(id="us-date-label", className="font-weight-bold"),
+                dcc.Slider(id="us-date-slider", min=0, max=0, step=1, value=0, marks={}, updatemode="mouseup")
+            ], md=8)
+        ], className="mb-4"),
+        dbc.Row(dbc.Col(dcc.Graph(
+            id="us-county-map",
+            config={"scrollZoom": True},
+            style={"height": "600px"}
+        ), width=12))
+    ], fluid=True)
+
+
+@app.callback(
+    [Output("us-date-slider", "max"),
+     Output("us-date-slider", "value"),
+     Output("us-date-slider", "marks"),
+     Output("us-state-dropdown", "options")],
+    Input("url", "pathname")
+)
+def init_us_map_controls(pathname):
+    if pathname != "/usmap":
+        raise dash.exceptions.PreventUpdate
+    try:
+        engine = get_county_engine()
+    except FileNotFoundError as e:
+        print(f"US county data not available: {e}")
+        return 0, 0, {}, []
+
+    last = len(engine.dates) - 1
+    # 每个季度第一天一个刻度
+    marks = {
+        int(i): engine.dates[i].strftime("%Y-%m")
+        for i in np.flatnonzero((engine.dates.day == 1) & (engine.dates.month % 3 == 1))
+    }
+    return last, last, marks, [{"label": s, "value": s} for s in engine.states]
+
+
+@app.callback(
+    [Output("us-county-map", "figure"),
+     Output("us-date-label", "children")],
+    [Input("us-date-slider", "value"),
+     Input("us-state-dropdown", "value")],
+    State("url", "pathname")
+)
+def update_us_map(day, states, pathname):
+    if pathname != "/usmap":
+        raise dash.exceptions.PreventUpdate
+    try:
+        engine = get_county_engine()
+    except FileNotFoundError:
+        return empty_map_figure(), NO_DATA_MESSAGE
+
+    day = min(max(day or 0, 0), len(engine.dates) - 1)
+    return engine.figure(day, states), f"Date: {engine.dates[day]:%Y-%m-%d}"
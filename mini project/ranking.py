@@ -0,0 +1,49 @@
+import numpy as np
+
+# -----------------------------------
+# 每天的国家排名索引
+# 对每个指标、每一天预先 argsort 一次（从大到小，NaN 排在最后），保存成紧凑的整数矩阵：
+#   order[指标, 天, 名次] = 国家行号      -> 某天前 N 名只读 N 个元素
+#   ranks[指标, 天, 国家行号] = 名次       -> 某国某天的名次 O(1)
+#   counts[指标, 天] = 数值不是 NaN 的国家数 -> 参与排名的国家数 O(1)，名次 >= counts 的国家没有名次
+# 国家少于 32768 个时用 int16。和 cube 的其它数组一起发布到共享数据（见 shared_data.py）。
+# 每天从前一天的顺序开始做稳定排序：相邻两天的名次变化很小，timsort 在接近有序的输入上快得多；
+# 并列时保持前一天的先后（第一天按国家名），bar chart race 里柱子不会来回跳。
+# -----------------------------------
+RANK_METRICS = [
+    "Confirmed",
+    "Deaths",
+    "Recovered",
+    "Active",
+    "New_Confirmed",
+    "New_Deaths",
+    "New_Confirmed_7d",
+    "New_Deaths_7d",
+    "Confirmed_per_100k",
+    "Deaths_per_100k",
+    "CFR",
+]
+
+
+def rank_dtype(n_countries):
+    return np.int16 if n_countries <= np.iinfo(np.int16).max + 1 else np.int32
+
+
+def build_rankings(metric_values, n_countries, n_days):
+    # metric_values(metric) -> (国家, 天) 数组；返回 (order, ranks, counts)，
+    # order / ranks 的形状是 (指标, 天, 国家)，counts 是 (指标, 天)
+    dtype = rank_dtype(n_countries)
+    order = np.empty((len(RANK_METRICS), n_days, n_countries), dtype=dtype)
+    ranks = np.empty_like(order)
+    counts = np.empty((len(RANK_METRICS), n_days), dtype=np.int32)
+    positions = np.broadcast_to(np.arange(n_countries, dtype=dtype), (n_days, n_countries))
+    for i, metric in enumerate(RANK_METRICS):
+        # 取负数后升序 = 降序；float 的 NaN 仍排在最后
+        values = np.ascontiguousarray(-np.asarray(metric_values(metric), dtype=np.float64).T)
+        counts[i] = n_countries - np.count_nonzero(np.isnan(values), axis=1)
+        previous = np.arange(n_countries)
+        for day in range(n_days):
+            previous = previous[np.argsort(values[day, previous], kind="stable")]
+            order[i, day] = previous
+        np.put_along_axis(ranks[i], order[i].astype(np.intp), positions, axis=1)
+    return order, ranks, counts
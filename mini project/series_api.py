@@ -0,0 +1,100 @@
+import json
+import numpy as np
+from flask import Response, abort, request
+from cube import METRICS, NEW_METRICS
+
+# -----------------------------------
+# Global Dashboard 的浏览器端模式
+# 每个国家的完整日序列只从 /data/series.json?country=... 取一次，缓存在 dcc.Store 里；
+# 之后改日期范围、切换图例都在 clientside callback 里完成，服务器不再参与。
+# 数据集版本变化时 Store 中的缓存整体作废（版本号同时用作 ETag）。
+# -----------------------------------
+SERIES_URL = "/data/series.json"
+
+# 选中国家中还没缓存的才去请求，返回合并后的 Store
+SERIES_FETCH_JS = """
+function(countries, mode, version, store) {
+    if (mode !== "client") {
+        return window.dash_clientside.no_update;
+    }
+    var cache = (store && store.version === version) ? store : {"version": version, "series": {}};
+    var missing = (countries || []).filter(function(c) { return !(c in cache.series); });
+    if (!missing.length) {
+        return cache === store ? window.dash_clientside.no_update : cache;
+    }
+    return Promise.all(missing.map(function(c) {
+        return fetch("%s?country=" + encodeURIComponent(c))
+            .then(function(response) { return response.ok ? response.json() : null; })
+            .catch(function() { return null; });
+    })).then(function(results) {
+        var series = Object.assign({}, cache.series);
+        results.forEach(function(s) { if (s) { series[s.country] = s; } });
+        return {"version": version, "series": series};
+    });
+}
+""" % SERIES_URL
+
+# 按日期范围切片，生成与服务端相同的两张图（layouts 由服务端预先生成，包含模板）
+SERIES_FIGURES_JS = """
+function(store, countries, start, end, mode, layouts) {
+    var no_update = window.dash_clientside.no_update;
+    if (mode !== "client" || !store || !layouts) {
+        return [no_update, no_update];
+    }
+    var DAY = 86400000;
+    function day(value) { return Date.parse(String(value).slice(0, 10)); }
+    var cumulative = [];
+    var daily = [];
+    (countries || []).forEach(function(country) {
+        var s = store.series[country];
+        if (!s) { return; }
+        var n = s.metrics.Confirmed.length;
+        var lo = start ? Math.max(0, Math.round((day(start) - s.start) / DAY)) : 0;
+        var hi = end ? Math.min(n, Math.round((day(end) - s.start) / DAY) + 1) : n;
+        var x = [];
+        for (var i = lo; i < hi; i++) { x.push(s.start + i * DAY); }
+        function trace(traces, metric, label) {
+            traces.push({
+                "type": "scatter", "mode": "lines+markers", "x": x,
+                "y": s.metrics[metric].slice(lo, hi), "name": country + " " + label
+            });
+        }
+        trace(cumulative, "Confirmed", "Cumulative Confirmed");
+        trace(cumulative, "Deaths", "Cumulative Deaths");
+        trace(cumulative, "Recovered", "Cumulative Recovered");
+        trace(daily, "New_Confirmed", "New Confirmed");
+        trace(daily, "New_Deaths", "New Deaths");
+        trace(daily, "New_Recovered", "New Recovered");
+    });
+    return [
+        {"data": cumulative, "layout": Object.assign({}, layouts[0], {"uirevision": "client"})},
+        {"data": daily, "layout": Object.assign({}, layouts[1], {"uirevision": "client"})}
+    ];
+}
+"""
+
+
+def series_payload(cube, country):
+    data = cube.series(country)
+    if data is None:
+        return None
+    start = int(np.datetime64(cube.start_date, "ms").astype(np.int64))
+    return {
+        "country": country,
+        "start": start,
+        "metrics": {metric: data[metric].tolist() for metric in METRICS + NEW_METRICS},
+    }
+
+
+def register_series_routes(server, get_data):
+    # get_data() -> (数据集版本, cube)
+    @server.route(SERIES_URL)
+    def serve_series():
+        version, cube = get_data()
+        payload = series_payload(cube, request.args.get("country", ""))
+        if payload is None:
+            abort(404)
+        response = Response(json.dumps(payload, separators=(",", ":")), mimetype="application/json")
+        response.set_etag(version)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
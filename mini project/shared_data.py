@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+import numpy as np
+from covid_data import load_global, dataset_version, clear_cache
+from cube import Cube, build_cube
+from derived import population_version
+
+try:
+    import fcntl
+except ImportError:  # Windows 上没有 fcntl，开发服务器只有一个进程，不需要加锁
+    fcntl = None
+
+# -----------------------------------
+# worker 共享的数据平面
+# 由一个进程把 cube 数组写成 dataset/shared/<版本>/*.npy，再原子地替换 current.json 指针；
+# 各 gunicorn worker 用 np.load(mmap_mode="r") 映射同一份文件，页缓存在进程间共享，不再各自复制。
+# 用法：gunicorn -c gunicorn.conf.py global_covid_dashboard:server
+# -----------------------------------
+shared_folder = os.environ.get("SHARED_DATA_DIR", os.path.join("dataset", "shared"))
+POINTER = "current.json"
+# 发布的文件格式变化时加一，旧格式的发布视为不存在，会重新构建
+FORMAT = 5
+
+
+def published_version():
+    # 病例数据的版本 + 人口表：每 10 万人等派生指标依赖人口表，编辑人口表后也重新发布
+    digest = hashlib.sha1(f"{dataset_version()};{population_version()}".encode())
+    return digest.hexdigest()[:16]
+
+
+def current_version(folder=shared_folder):
+    try:
+        with open(os.path.join(folder, POINTER), encoding="utf-8") as f:
+            pointer = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if pointer.get("format") != FORMAT:
+        return None
+    return pointer.get("version")
+
+
+def publish(cube, version, folder=shared_folder):
+    target = os.path.join(folder, version)
+    tmp_target = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(tmp_target, exist_ok=True)
+    np.save(os.path.join(tmp_target, "values.npy"), np.ascontiguousarray(cube.values))
+    np.save(os.path.join(tmp_target, "new_values.npy"), np.ascontiguousarray(cube.new_values))
+    np.save(os.path.join(tmp_target, "active.npy"), np.ascontiguousarray(cube.active))
+    np.save(os.path.join(tmp_target, "derived.npy"), np.ascontiguousarray(cube.derived))
+    np.save(os.path.join(tmp_target, "order.npy"), np.ascontiguousarray(cube.order))
+    np.save(os.path.join(tmp_target, "ranks.npy"), np.ascontiguousarray(cube.ranks))
+    np.save(os.path.join(tmp_target, "ranked_counts.npy"), np.ascontiguousarray(cube.ranked_counts))
+    with open(os.path.join(tmp_target, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "countries": cube.countries,
+            "start_date": cube.start_date.strftime("%Y-%m-%d"),
+        }, f)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.replace(tmp_target, target)
+
+    # 原子地切换到新版本
+    previous = current_version(folder)
+    pointer = os.path.join(folder, POINTER)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": version, "format": FORMAT}, f)
+    os.replace(f"{pointer}.tmp", pointer)
+    # 上一个版本也保留：其它 worker 可能刚读到旧指针、还没有映射（见 attach）
+    remove_old_versions(folder, keep={version, previous})
+
+
+def remove_old_versions(folder, keep):
+    # 已经映射旧文件的 worker 不受影响（文件删除后映射仍然有效）；
+    # 只删除比 keep 更旧的版本，正在切换中的 worker 至少能找到上一个版本
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if os.path.isdir(path) and name not in keep and not name.endswith(".tmp"):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def attach(folder=shared_folder, version=None):
+    # 零拷贝地映射已发布的 cube，返回 (版本, Cube)。
+    # 读取指针和映射文件时持有共享锁，发布（排他锁）不会在中途替换或删除版本目录；
+    # 映射完成后即使目录被删除，映射仍然有效。
+    # 指定的 version 已经被更新的发布删除时，改为映射当前版本
+    with publish_lock(folder, shared=True):
+        try:
+            return map_version(folder, version or current_version(folder))
+        except FileNotFoundError:
+            if version is None:
+                raise
+            return map_version(folder, current_version(folder))
+
+
+def map_version(folder, version):
+    target = os.path.join(folder, version)
+    with open(os.path.join(target, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    cube = Cube(
+        np.load(os.path.join(target, "values.npy"), mmap_mode="r"),
+        meta["countries"],
+        meta["start_date"],
+        new_values=np.load(os.path.join(target, "new_values.npy"), mmap_mode="r"),
+        active=np.load(os.path.join(target, "active.npy"), mmap_mode="r"),
+        derived=np.load(os.path.join(target, "derived.npy"), mmap_mode="r"),
+        rankings=(
+            np.load(os.path.join(target, "order.npy"), mmap_mode="r"),
+            np.load(os.path.join(target, "ranks.npy"), mmap_mode="r"),
+            np.load(os.path.join(target, "ranked_counts.npy"), mmap_mode="r")
+        )
+    )
+    return version, cube
+
+
+@contextmanager
+def publish_lock(folder=shared_folder, shared=False):
+    # 发布时取排他锁，attach 取共享锁，多个 worker 可以同时映射
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_published(folder=shared_folder):
+    # 源数据或人口表的版本与已发布版本不同时重新构建并发布；多个进程同时调用时只有一个会构建
+    version = published_version()
+    with publish_lock(folder):
+        if current_version(folder) != version:
+            publish(build_cube(load_global()), version, folder)
+            clear_cache()
+    return version
+
+
+def load_shared_cube(folder=shared_folder):
+    ensure_published(folder)
+    return attach(folder)
+
+
+if __name__ == '__main__':
+    print("Published dataset version:", ensure_published())
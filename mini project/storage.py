@@ -0,0 +1,57 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# -----------------------------------
+# Arrow IPC (Feather v2) 列式存储
+# 代替 converted_*_data.csv / global_covid19_dataset.csv 这些中间文件：
+# Country/Region 以字典编码保存，Date 以 date64 保存，读取时不再需要 pd.to_datetime
+# -----------------------------------
+data_folder = 'dataset'
+
+
+def table_path(name, folder=data_folder):
+    return os.path.join(folder, f"{name}.arrow")
+
+
+def save_table(df, name, folder=data_folder):
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        if field.name in ("Country/Region", "Province/State") and not pa.types.is_dictionary(field.type):
+            column = column.dictionary_encode()
+        elif field.name == "Date":
+            column = column.cast(pa.date64())
+        columns.append(column)
+    table = pa.Table.from_arrays(columns, names=table.column_names)
+
+    # 先写临时文件再替换，避免读取方看到写了一半的文件；
+    # 临时文件名带进程号，多个 gunicorn worker 同时生成同一个表时不会互相覆盖
+    path = table_path(name, folder)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def load_table(name, folder=data_folder, columns=None):
+    path = table_path(name, folder)
+    if os.path.exists(path):
+        # 未压缩的 IPC 文件可以直接 memory map
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(date_as_object=False)
+
+    # 兼容旧流程：还没有生成 .arrow 文件时退回到 CSV
+    csv_path = os.path.join(folder, f"{name}.csv")
+    df = pd.read_csv(csv_path, usecols=columns)
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"])
+    return df
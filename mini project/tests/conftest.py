@@ -0,0 +1,10 @@
+import os
+import sys
+
+# -----------------------------------
+# 测试直接导入项目里的平铺模块和 benchmarks/ 下的辅助脚本（synthetic.py 等）
+# 在 "mini project" 目录下运行：python -m pytest -q
+# -----------------------------------
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT)
+sys.path.insert(0, os.path.join(PROJECT, "benchmarks"))
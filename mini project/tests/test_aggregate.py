@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+from aggregate import aggregate_global
+from bench_aggregate import legacy_aggregate
+from synthetic import synthetic_frames
+
+
+@pytest.fixture(scope="module")
+def frames():
+    # 小规模的合成 JHU 宽表：多省份国家、康复表缺少部分省份行
+    data = synthetic_frames(scale=1, n_days=40, seed=1)
+    return data["Confirmed"], data["Deaths"], data["Recovered"]
+
+
+def test_matches_legacy_pipeline(frames):
+    # 与旧流程（melt -> 三次 groupby -> 两次 outer merge）的行、列、数值完全一致
+    expected = legacy_aggregate(*frames).sort_values(["Country/Region", "Date"], ignore_index=True)
+    result = aggregate_global(*frames)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_new_columns_are_daily_differences(frames):
+    result = aggregate_global(*frames, with_new=True)
+    for metric in ("Confirmed", "Deaths", "Recovered"):
+        diff = result.groupby("Country/Region")[metric].diff().fillna(0)
+        np.testing.assert_allclose(result[f"New_{metric}"], diff)
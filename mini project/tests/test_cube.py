@@ -0,0 +1,27 @@
+import numpy as np
+from cube import Cube
+
+
+def cube_with_cruise_ship():
+    # Diamond Princess 没有人口数据，每 10 万人指标为 NaN
+    values = np.zeros((3, 3, 10), dtype=np.int32)
+    values[0] = np.array([[10], [20], [700]]) * np.arange(1, 11)
+    values[1] = values[0] // 10
+    return Cube(values, ["Diamond Princess", "Italy", "US"], "2020-03-01")
+
+
+def test_rank_is_none_for_nan_values():
+    cube = cube_with_cruise_ship()
+    assert cube.rank("Confirmed_per_100k", "Diamond Princess") is None
+    assert cube.rank("Confirmed_per_100k", "US") in (1, 2)
+    assert cube.ranked_count("Confirmed_per_100k") == 2
+    assert cube.rank("Confirmed", "Diamond Princess") == 3
+    assert cube.ranked_count("Confirmed") == 3
+
+
+def test_top_skips_nan_values():
+    cube = cube_with_cruise_ship()
+    leaders = cube.top("Confirmed_per_100k", n=10)
+    assert len(leaders) == 2
+    assert "Diamond Princess" not in dict(leaders)
+    assert [country for country, _ in cube.top("Confirmed", n=10)] == ["US", "Italy", "Diamond Princess"]
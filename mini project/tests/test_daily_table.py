@@ -0,0 +1,42 @@
+import pytest
+import pandas as pd
+from daily_table import table_page
+
+
+def daily_frame(n):
+    return pd.DataFrame({
+        "Country/Region": ["US"] * n,
+        "Date": pd.date_range("2021-03-01", periods=n, freq="D"),
+        "Confirmed": range(n),
+    })
+
+
+def test_page_current_is_clamped_to_page_count():
+    records, page_count, page_current = table_page(daily_frame(25), "", [], 7, 10)
+    assert (page_count, page_current) == (3, 2)
+    assert [row["Confirmed"] for row in records] == [20, 21, 22, 23, 24]
+
+
+def test_filter_shrinks_to_first_page():
+    records, page_count, page_current = table_page(daily_frame(25), "{Confirmed} >= 18", [], 2, 10)
+    assert (page_count, page_current) == (1, 0)
+    assert records[0] == {"Country/Region": "US", "Date": "2021-03-19", "Confirmed": 18}
+
+
+def test_sort_descending():
+    records, _, _ = table_page(daily_frame(5), None, [{"column_id": "Confirmed", "direction": "desc"}], 0, 2)
+    assert [row["Confirmed"] for row in records] == [4, 3]
+
+
+@pytest.mark.parametrize("filter_query", ["{Confirmed} > abc", "{Country/Region} > 3", "{Date} > yesterday"])
+def test_mismatched_filter_value_is_skipped(filter_query):
+    records, page_count, _ = table_page(daily_frame(25), filter_query, [], 0, 10)
+    assert page_count == 3 and len(records) == 10
+
+
+def test_date_and_string_comparisons():
+    df = daily_frame(25)
+    records, _, _ = table_page(df, "{Date} >= 2021-03-20 && {Confirmed} < 21", [], 0, 10)
+    assert [row["Confirmed"] for row in records] == [19, 20]
+    records, _, _ = table_page(df, "{Country/Region} = US && {Confirmed} = 3", [], 0, 10)
+    assert [row["Date"] for row in records] == ["2021-03-04"]
@@ -0,0 +1,58 @@
+import math
+import numpy as np
+import derived
+import shared_data
+from derived import DERIVED_METRICS, GROWTH_WINDOW, derived_values, ratio, rolling_mean
+
+
+def test_rolling_mean_averages_available_days():
+    np.testing.assert_allclose(rolling_mean(np.array([1, 2, 3, 4, 10]), 2), [1, 1.5, 2.5, 3.5, 7])
+    np.testing.assert_allclose(rolling_mean(np.array([[3, 3, 6]]), 7), [[3, 3, 4]])
+
+
+def test_ratio_is_nan_for_zero_denominator():
+    np.testing.assert_allclose(ratio(np.array([5.0, 5.0]), np.array([0.0, 2.0]), 100), [np.nan, 250])
+
+
+def metric(out, name):
+    return out[DERIVED_METRICS.index(name)]
+
+
+def test_growth_rate_and_doubling_time():
+    # 三个国家、GROWTH_WINDOW + 1 天：7 天翻倍、7 天减半（向下修订）、第一天为 0
+    days = GROWTH_WINDOW + 1
+    confirmed = np.zeros((3, days))
+    confirmed[0] = np.linspace(100, 200, days)
+    confirmed[1] = np.linspace(100, 50, days)
+    confirmed[2, 1:] = 10
+    values = np.stack([confirmed, confirmed / 10, np.zeros_like(confirmed)])
+    new_values = np.diff(values, axis=2, prepend=values[:, :, :1])
+    out = derived_values(values, new_values, np.array([1e6, np.nan, 0]))
+
+    growth = metric(out, "Growth_Rate")[:, -1]
+    doubling = metric(out, "Doubling_Time")[:, -1]
+    assert math.isclose(growth[0], (2 ** (1 / GROWTH_WINDOW) - 1) * 100, rel_tol=1e-6)
+    assert math.isclose(doubling[0], GROWTH_WINDOW, rel_tol=1e-6)
+    # 负增长：增长率为负，倍增时间没有定义
+    assert math.isclose(growth[1], (0.5 ** (1 / GROWTH_WINDOW) - 1) * 100, rel_tol=1e-6)
+    assert np.isnan(doubling[1])
+    # GROWTH_WINDOW 天前为 0：都没有定义
+    assert np.isnan(growth[2]) and np.isnan(doubling[2])
+    # 前 GROWTH_WINDOW 天没有足够的历史
+    assert np.isnan(metric(out, "Growth_Rate")[:, :GROWTH_WINDOW]).all()
+
+    per_100k = metric(out, "Confirmed_per_100k")[:, -1]
+    assert math.isclose(per_100k[0], 200 / 1e6 * 1e5, rel_tol=1e-6)
+    assert np.isnan(per_100k[1]) and np.isnan(per_100k[2])
+    cfr = metric(out, "CFR")[:, 0]
+    assert math.isclose(cfr[0], 10, rel_tol=1e-6) and np.isnan(cfr[2])
+
+
+def test_population_edit_changes_published_version(tmp_path, monkeypatch):
+    path = tmp_path / "population.csv"
+    path.write_text("Country/Region,Population\nItaly,60461828\n")
+    monkeypatch.setattr(derived, "POPULATION_FILE", str(path))
+    monkeypatch.setattr(shared_data, "dataset_version", lambda: "cases")
+    before = shared_data.published_version()
+    path.write_text("Country/Region,Population\nItaly,58850717.0\n")
+    assert shared_data.published_version() != before
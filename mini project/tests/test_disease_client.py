@@ -0,0 +1,38 @@
+import threading
+import pytest
+import requests
+import disease_client
+
+
+class Response:
+    status_code = 200
+
+    def json(self):
+        return {"country": "Italy"}
+
+
+def test_waiter_times_out_when_the_owner_hangs(monkeypatch):
+    # 第一个线程的请求卡住时，等待同一 URL 的其它调用按超时失败，而不是一直等下去
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_get(url, timeout):
+        started.set()
+        release.wait(5)
+        return Response()
+
+    monkeypatch.setattr(disease_client.session, "get", slow_get)
+    monkeypatch.setattr(disease_client, "WAIT_TIMEOUT", 0.1)
+    monkeypatch.setattr(disease_client, "_cache", {})
+    path = "countries/Italy?strict=true&test=hang"
+    owner = threading.Thread(target=disease_client.get_json, args=(path,))
+    owner.start()
+    assert started.wait(5)
+    try:
+        with pytest.raises(requests.Timeout):
+            disease_client.get_json(path)
+    finally:
+        release.set()
+        owner.join()
+    # 发起请求的线程完成后结果进入缓存
+    assert disease_client.get_json(path) == (200, {"country": "Italy"})
@@ -0,0 +1,68 @@
+import json
+import random
+import pytest
+from disease_stream import iter_json_array, historical_frame
+
+# -----------------------------------
+# 流式解析的 fuzz 测试：随机的国家对象和空白，按各种块大小切分字节流，
+# 结果必须和一次性 json.loads 相同（包括跨块切开的多字节 UTF-8 字符）
+# -----------------------------------
+COUNTRIES = ["US", "Italy", "Curaçao", "Côte d'Ivoire", "Réunion", "中国", "Korea, South"]
+
+
+def random_record(rng):
+    days = [f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/2{rng.randint(0, 3)}" for _ in range(rng.randint(0, 6))]
+    timeline = {
+        "cases": {day: rng.randint(0, 10 ** 6) for day in days},
+        "deaths": {day: rng.randint(0, 10 ** 4) for day in days if rng.random() < 0.9},
+        "recovered": {day: rng.randint(0, 10 ** 5) for day in days if rng.random() < 0.5},
+    }
+    return {"country": rng.choice(COUNTRIES), "province": rng.choice([None, "Île-de-France"]), "timeline": timeline}
+
+
+def random_json(rng, records):
+    space = lambda: rng.choice(["", " ", "\n", "\t ", "\r\n  "])
+    items = [space() + json.dumps(record, ensure_ascii=rng.random() < 0.5) + space() for record in records]
+    return (space() + "[" + ",".join(items) + "]" + space()).encode("utf-8")
+
+
+def chunked(data, sizes):
+    pos = 0
+    while pos < len(data):
+        size = next(sizes)
+        yield data[pos:pos + size]
+        pos += size
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096, None])
+def test_iter_json_array_matches_json_loads(chunk_size):
+    rng = random.Random(chunk_size or 0)
+    for _ in range(30):
+        records = [random_record(rng) for _ in range(rng.randint(0, 8))]
+        data = random_json(rng, records)
+        if chunk_size is None:
+            sizes = iter(lambda: rng.randint(1, 50), None)
+        else:
+            sizes = iter(lambda: chunk_size, None)
+        assert list(iter_json_array(chunked(data, sizes))) == json.loads(data)
+
+
+def test_iter_json_array_rejects_truncated_input():
+    data = json.dumps([{"country": "US"}, {"country": "Italy"}]).encode("utf-8")[:-5]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(chunked(data, iter(lambda: 4, None))))
+
+
+def test_historical_frame_skips_records_without_country():
+    timeline = {"cases": {"1/22/20": 1, "1/23/20": 2}, "deaths": {"1/22/20": 0, "1/23/20": 1}, "recovered": {}}
+    records = [
+        {"country": "US", "timeline": timeline},
+        {"timeline": timeline},
+        {"country": None, "timeline": timeline},
+        {"country": "  ", "timeline": timeline},
+        {"country": " US ", "timeline": timeline},
+    ]
+    df = historical_frame(records)
+    assert list(df["Country/Region"].cat.categories) == ["US"]
+    assert len(df) == 4
+    assert df["Deaths"].sum() == 2
@@ -0,0 +1,11 @@
+from check_import_time import LAZY_MODULES, MODULE, import_profile
+
+# -----------------------------------
+# 导入 global_covid_dashboard 时不导入回调里才用到的重模块（见 benchmarks/check_import_time.py）；
+# 耗时预算依赖机器负载，只由 check_import_time.py 检查，不放在 pytest 里
+# -----------------------------------
+
+
+def test_heavy_modules_are_imported_lazily():
+    imported = {row[0] for row in import_profile(MODULE)}
+    assert [module for module in LAZY_MODULES if module in imported] == []
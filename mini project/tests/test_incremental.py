@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+import incremental
+from storage import load_table
+from synthetic import FILES, synthetic_frames
+
+# -----------------------------------
+# 增量导入与 --full 全量导入的结果一致：正常追加一列日期、旧列被重排
+# -----------------------------------
+
+
+def write_sources(folder, frames, columns):
+    folder.mkdir(exist_ok=True)
+    for metric, filename in FILES.items():
+        frames[metric][incremental.ID_VARS + columns].to_csv(folder / filename, index=False)
+
+
+def tables():
+    result = {}
+    for name in list(incremental.LONG_TABLES.values()) + [incremental.GLOBAL_TABLE]:
+        df = load_table(name).astype({"Country/Region": str})
+        keys = [c for c in ("Country/Region", "Province/State", "Date") if c in df.columns]
+        result[name] = df.sort_values(keys, ignore_index=True)
+    return result
+
+
+def full_tables(tmp_path, monkeypatch, frames, columns):
+    monkeypatch.chdir(tmp_path / "full")
+    write_sources(tmp_path / "full" / "dataset", frames, columns)
+    incremental.ingest(full=True)
+    return tables()
+
+
+@pytest.fixture
+def frames():
+    return synthetic_frames(scale=1, n_days=12, seed=3)
+
+
+@pytest.fixture
+def date_columns(frames):
+    return [c for c in frames["Confirmed"].columns if c not in incremental.ID_VARS]
+
+
+def assert_same_tables(result, expected):
+    assert result.keys() == expected.keys()
+    for name in expected:
+        pd.testing.assert_frame_equal(result[name], expected[name], check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("change", ["append", "reorder"])
+def test_incremental_matches_full(tmp_path, monkeypatch, frames, date_columns, change):
+    (tmp_path / "full").mkdir()
+    (tmp_path / "incremental").mkdir()
+    if change == "append":
+        before, after = date_columns[:-1], date_columns
+    else:
+        # 中间两列交换：旧列不再是新列的前缀
+        before = date_columns
+        after = date_columns[:4] + [date_columns[5], date_columns[4]] + date_columns[6:]
+    expected = full_tables(tmp_path, monkeypatch, frames, after)
+
+    monkeypatch.chdir(tmp_path / "incremental")
+    folder = tmp_path / "incremental" / "dataset"
+    write_sources(folder, frames, before)
+    incremental.ingest()
+    write_sources(folder, frames, after)
+    incremental.ingest()
+    assert_same_tables(tables(), expected)
@@ -0,0 +1,48 @@
+import os
+import metrics
+
+
+def other_worker(folder, pid, calls, seconds):
+    # 模拟另一个 worker 写出的统计文件
+    metrics._dump({
+        "dash_callback_calls_total": {(("callback", "update_leaderboard"), ("status", "ok")): calls},
+        "dash_callback_seconds": {(("callback", "update_leaderboard"),): seconds},
+    }, os.path.join(folder, f"{pid}.json"))
+
+
+def sample(text, line_start):
+    return [line for line in text.splitlines() if line.startswith(line_start)]
+
+
+def test_render_sums_all_worker_files(tmp_path):
+    folder = str(tmp_path)
+    before = metrics.CALLBACK_CALLS.snapshot().get((("callback", "update_leaderboard"), ("status", "ok")), 0)
+    metrics.CALLBACK_CALLS.inc(callback="update_leaderboard", status="ok")
+    buckets = [0] * (len(metrics.LATENCY_BUCKETS) + 1) + [0.0]
+    buckets[0], buckets[-1] = 2, 0.004
+    other_worker(folder, 999999, 3, buckets)
+
+    text = metrics.render(folder)
+    assert os.path.exists(os.path.join(folder, f"{os.getpid()}.json"))
+    assert sample(text, 'dash_callback_calls_total{callback="update_leaderboard",status="ok"}') == [
+        f'dash_callback_calls_total{{callback="update_leaderboard",status="ok"}} {before + 4}'
+    ]
+    assert 'dash_callback_seconds_count{callback="update_leaderboard"}' in text
+
+
+def test_dead_worker_is_archived(tmp_path):
+    folder = str(tmp_path)
+    other_worker(folder, 999998, 2, [0] * (len(metrics.LATENCY_BUCKETS) + 2))
+    other_worker(folder, 999999, 5, [0] * (len(metrics.LATENCY_BUCKETS) + 2))
+    metrics.mark_process_dead(999998, folder)
+    metrics.mark_process_dead(999999, folder)
+    assert sorted(os.listdir(folder)) == [metrics.ARCHIVE]
+    archived = metrics._load(os.path.join(folder, metrics.ARCHIVE))
+    assert archived["dash_callback_calls_total"] == {(("callback", "update_leaderboard"), ("status", "ok")): 7}
+
+
+def test_reset_removes_previous_run(tmp_path):
+    folder = str(tmp_path)
+    other_worker(folder, 999999, 1, [0] * (len(metrics.LATENCY_BUCKETS) + 2))
+    metrics.reset_multiproc_dir(folder)
+    assert os.listdir(folder) == []
@@ -0,0 +1,49 @@
+import json
+import os
+import shutil
+import pytest
+import owid_mirror
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "owid-covid-data.csv")
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    # 离线运行：OWID_SOURCE 指向本地 CSV，镜像写到临时目录
+    source = tmp_path / "owid-covid-data.csv"
+    shutil.copy(FIXTURE, source)
+    folder = tmp_path / "owid"
+    monkeypatch.setenv("OWID_SOURCE", str(source))
+    monkeypatch.setattr(owid_mirror, "mirror_folder", str(folder))
+    monkeypatch.setattr(owid_mirror, "index_path", str(folder / "latest.json"))
+    monkeypatch.setattr(owid_mirror, "meta_path", str(folder / "meta.json"))
+    monkeypatch.setattr(owid_mirror, "_index", {"mtime": None, "rows": {}})
+    return source
+
+
+def test_refresh_builds_latest_row_per_country(mirror):
+    assert owid_mirror.refresh()
+    italy = owid_mirror.lookup(" ITALY ")
+    assert italy["date"] == "2023-03-08"
+    assert italy["total_cases"] == 25603510
+    assert owid_mirror.lookup("Atlantis") is None
+
+
+def test_index_is_valid_json_with_nulls(mirror):
+    owid_mirror.refresh()
+    with open(owid_mirror.index_path, encoding="utf-8") as f:
+        rows = json.loads(f.read(), parse_constant=lambda name: pytest.fail(f"{name} in JSON"))
+    assert rows["antarctica"]["total_deaths"] is None
+    assert rows["antarctica"]["population"] is None
+
+
+def test_unchanged_source_is_skipped(mirror):
+    assert owid_mirror.refresh()
+    assert not owid_mirror.refresh()
+
+
+def test_deleted_index_is_rebuilt(mirror):
+    owid_mirror.refresh()
+    os.remove(owid_mirror.index_path)
+    assert owid_mirror.refresh()
+    assert owid_mirror.is_ready()
@@ -0,0 +1,39 @@
+import numpy as np
+from ranking import RANK_METRICS, build_rankings
+
+# -----------------------------------
+# 排名索引：order 从大到小、NaN 在最后，并列时保持前一天的先后，ranks 是 order 的逆置换
+# -----------------------------------
+
+
+def rankings_for(values):
+    # 所有排名指标都用同一个 (国家, 天) 数组
+    values = np.asarray(values, dtype=float)
+    return build_rankings(lambda metric: values, values.shape[0], values.shape[1])
+
+
+def test_order_is_descending_with_nan_last():
+    order, ranks, counts = rankings_for([[1, 5], [3, np.nan], [2, 4]])
+    assert order[0, 0].tolist() == [1, 2, 0]
+    assert order[0, 1].tolist() == [0, 2, 1]
+    assert counts[0].tolist() == [3, 2]
+    assert counts.shape == (len(RANK_METRICS), 2)
+
+
+def test_ties_keep_previous_day_order():
+    # 第 0 天按国家行号并列；第 1 天 C 领先；第 2 天三国再次并列，保持第 1 天的 C, B, A
+    order, _, _ = rankings_for([[1, 1, 7], [1, 2, 7], [1, 3, 7]])
+    assert order[0, 0].tolist() == [0, 1, 2]
+    assert order[0, 1].tolist() == [2, 1, 0]
+    assert order[0, 2].tolist() == [2, 1, 0]
+
+
+def test_ranks_are_inverse_of_order():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 5, size=(30, 12)).astype(float)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    order, ranks, counts = rankings_for(values)
+    for day in range(values.shape[1]):
+        np.testing.assert_array_equal(ranks[0, day, order[0, day]], np.arange(30))
+        np.testing.assert_array_equal(order[0, day, ranks[0, day]], np.arange(30))
+        assert counts[0, day] == np.count_nonzero(~np.isnan(values[:, day]))
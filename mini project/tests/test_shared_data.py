@@ -0,0 +1,49 @@
+import os
+import numpy as np
+import pytest
+import shared_data
+from cube import Cube
+
+
+def small_cube(seed):
+    rng = np.random.default_rng(seed)
+    values = np.cumsum(rng.integers(0, 50, size=(3, 4, 20)), axis=2).astype(np.int32)
+    return Cube(values, ["Andorra", "Brazil", "Chile", "Denmark"], "2020-01-22")
+
+
+def versions(folder):
+    return sorted(name for name in os.listdir(folder) if os.path.isdir(os.path.join(folder, name)))
+
+
+def test_attach_maps_published_arrays(tmp_path):
+    cube = small_cube(0)
+    shared_data.publish(cube, "v1", str(tmp_path))
+    version, attached = shared_data.attach(str(tmp_path))
+    assert version == "v1"
+    assert isinstance(attached.values, np.memmap)
+    np.testing.assert_array_equal(attached.values, cube.values)
+    np.testing.assert_array_equal(attached.ranks, cube.ranks)
+    np.testing.assert_array_equal(attached.ranked_counts, cube.ranked_counts)
+    # Active 也从发布的文件映射，不在每个 worker 里重新计算
+    assert isinstance(attached.active, np.memmap)
+    np.testing.assert_array_equal(attached.active, cube.active)
+
+
+def test_previous_version_is_kept(tmp_path):
+    folder = str(tmp_path)
+    for i, version in enumerate(["v1", "v2", "v3"]):
+        shared_data.publish(small_cube(i), version, folder)
+    assert shared_data.current_version(folder) == "v3"
+    # 刚读到 v2 指针的 worker 仍然能映射 v2
+    assert versions(folder) == ["v2", "v3"]
+    assert shared_data.attach(folder, "v2")[0] == "v2"
+
+
+def test_attach_falls_back_to_current_version(tmp_path):
+    folder = str(tmp_path)
+    shared_data.publish(small_cube(0), "v1", folder)
+    shared_data.publish(small_cube(1), "v2", folder)
+    shared_data.publish(small_cube(2), "v3", folder)
+    assert shared_data.attach(folder, "v1")[0] == "v3"
+    with pytest.raises(FileNotFoundError):
+        shared_data.map_version(folder, "v1")
@@ -0,0 +1,21 @@
+from us_counties import build_engine, CONFIRMED_US, DEATHS_US
+
+CONFIRMED = """UID,FIPS,Admin2,Province_State,Lat,Long_,1/22/20,1/23/20
+1,1001,Autauga,Alabama,32.5,-86.6,1,
+2,1003,Baldwin,Alabama,30.7,-87.7,,5
+3,,Unassigned,Alabama,0,0,0,1
+"""
+DEATHS = """UID,FIPS,Admin2,Province_State,Lat,Long_,Population,1/22/20,1/23/20
+1,1001,Autauga,Alabama,32.5,-86.6,55869,0,1
+3,,Unassigned,Alabama,0,0,0,0,0
+"""
+
+
+def test_empty_cells_are_read_as_zero(tmp_path):
+    (tmp_path / CONFIRMED_US).write_text(CONFIRMED)
+    (tmp_path / DEATHS_US).write_text(DEATHS)
+    engine = build_engine(str(tmp_path))
+    assert engine.confirmed.tolist() == [[1, 0], [0, 5]]
+    # Baldwin 不在死亡表里
+    assert engine.deaths.tolist() == [[0, 1], [0, 0]]
+    assert engine.confirmed.dtype.name == "int32"
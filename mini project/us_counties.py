@@ -0,0 +1,125 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from us_map import county_map_figure
+
+# -----------------------------------
+# US 县级数据引擎
+# 按 FIPS 索引的 (县, 天) 稠密数组保存累计确诊和死亡，
+# dashboard 第一次打开 /usmap 时才加载，之后按日期和州在服务端生成地图
+# -----------------------------------
+data_folder = 'dataset'
+CONFIRMED_US = 'time_series_covid19_confirmed_US.csv'
+DEATHS_US = 'time_series_covid19_deaths_US.csv'
+META_COLUMNS = ['FIPS', 'Admin2', 'Province_State', 'Lat', 'Long_']
+DATE_FORMAT = "%m/%d/%y"
+
+_lock = threading.Lock()
+_engine = None
+
+
+def date_columns(columns):
+    parsed = pd.to_datetime(pd.Index(columns), format=DATE_FORMAT, errors="coerce")
+    return [c for c, d in zip(columns, parsed) if not pd.isna(d)]
+
+
+def read_header(path):
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_us_table(path, columns):
+    # 只读取需要的列（县信息 + 指定的日期列）；日期列先按 float 解析，空单元格记为 0 后转成 int32
+    # （直接按 int32 解析遇到空值会报错）。
+    # FIPS 转成整数键，没有 FIPS 的行（邮轮、部分 "Out of ..." 记录）丢弃
+    df = pd.read_csv(
+        path,
+        usecols=META_COLUMNS + columns,
+        dtype={c: np.float64 for c in columns}
+    )
+    df[columns] = df[columns].fillna(0).astype(np.int32)
+    df = df.dropna(subset=['FIPS']).astype({'FIPS': np.int64})
+    return df.drop_duplicates('FIPS').set_index('FIPS')
+
+
+def common_date_columns(folder=data_folder):
+    # 只扫描表头，确定确诊和死亡两个表共有的日期列
+    death_header = set(read_header(os.path.join(folder, DEATHS_US)))
+    return [c for c in date_columns(read_header(os.path.join(folder, CONFIRMED_US))) if c in death_header]
+
+
+def load_us_counties(folder=data_folder, columns=None):
+    # 返回按 FIPS 索引的 (县信息, 确诊宽表, 死亡宽表)；columns 为 None 时读取全部日期
+    if columns is None:
+        columns = common_date_columns(folder)
+    df_confirmed = read_us_table(os.path.join(folder, CONFIRMED_US), columns)
+    df_deaths = read_us_table(os.path.join(folder, DEATHS_US), columns).reindex(df_confirmed.index)
+    meta = df_confirmed[['Admin2', 'Province_State', 'Lat', 'Long_']]
+    return meta, df_confirmed[columns], df_deaths[columns].fillna(0)
+
+
+def load_us_latest(folder=data_folder):
+    # 只读取最新一天的列，按整数 FIPS 连接确诊和死亡
+    latest = max(common_date_columns(folder), key=lambda c: pd.to_datetime(c, format=DATE_FORMAT))
+    meta, confirmed, deaths = load_us_counties(folder, [latest])
+    df_county = meta.copy()
+    df_county['Confirmed'] = confirmed[latest]
+    df_county['Deaths'] = deaths[latest]
+    return pd.to_datetime(latest, format=DATE_FORMAT), df_county.reset_index()
+
+
+def latest_map_figure(folder=data_folder):
+    latest_date_us, df_county = load_us_latest(folder)
+    return county_map_figure(df_county, title=f"US COVID-19 Confirmed Cases by County ({latest_date_us:%Y-%m-%d})")
+
+
+class CountyEngine:
+    def __init__(self, meta, dates, confirmed, deaths):
+        self.meta = meta.reset_index(drop=True)
+        self.fips = self.meta['FIPS'].to_numpy()
+        self.fips_index = {f: i for i, f in enumerate(self.fips)}
+        self.dates = dates
+        self.confirmed = confirmed
+        self.deaths = deaths
+        self.states = sorted(self.meta['Province_State'].dropna().unique())
+
+    def day_position(self, date=None):
+        if date is None:
+            return len(self.dates) - 1
+        pos = self.dates.searchsorted(pd.Timestamp(date), side="right") - 1
+        return int(min(max(pos, 0), len(self.dates) - 1))
+
+    def county_frame(self, day, states=None):
+        rows = np.arange(len(self.meta))
+        if states:
+            rows = rows[self.meta['Province_State'].isin(states).to_numpy()]
+        df_county = self.meta.iloc[rows].copy()
+        df_county['Confirmed'] = self.confirmed[rows, day]
+        df_county['Deaths'] = self.deaths[rows, day]
+        return df_county
+
+    def figure(self, day, states=None):
+        date = self.dates[day]
+        return county_map_figure(
+            self.county_frame(day, states),
+            title=f"US COVID-19 Confirmed Cases by County ({date:%Y-%m-%d})"
+        )
+
+
+def build_engine(folder=data_folder):
+    meta, confirmed, deaths = load_us_counties(folder)
+    dates = pd.DatetimeIndex(pd.to_datetime(confirmed.columns, format=DATE_FORMAT))
+    return CountyEngine(
+        meta.reset_index(),
+        dates,
+        confirmed.to_numpy(dtype=np.int32),
+        deaths.to_numpy(dtype=np.int32)
+    )
+
+
+def get_engine():
+    global _engine
+    with _lock:
+        if _engine is None:
+            _engine = build_engine()
+        return _engine
@@ -0,0 +1,109 @@
+import threading
+import numpy as np
+import plotly.graph_objs as go
+import plotly.io as pio
+from flask import Response
+
+# -----------------------------------
+# US 县级地图：所有县作为一个 WebGL 散点图层（go.Scattermap）绘制，
+# 坐标和数值以 numpy 数组写入图表，plotly 序列化时编码成 base64 typed array，
+# 取代 3000+ 个 folium.Marker 组成的 HTML
+# -----------------------------------
+US_MAP_URL = "/data/us-county-map.json"
+NO_DATA_MESSAGE = "US county data not found. Add time_series_covid19_confirmed_US.csv and deaths_US.csv to dataset/."
+
+# /usmap 页面在浏览器中拉取图表（第一次请求时在服务端生成，见 register_us_map_route）
+US_MAP_CLIENTSIDE_JS = """
+function(pathname) {
+    if (pathname !== "/usmap") {
+        return window.dash_clientside.no_update;
+    }
+    return fetch("%s")
+        .then(function(response) { return response.json(); })
+        .catch(function() { return {"data": [], "layout": {}}; });
+}
+""" % US_MAP_URL
+
+
+def county_names(df_county):
+    state = df_county["Province_State"].astype(str)
+    county = df_county["Admin2"]
+    return (county.astype(str) + ", " + state).where(county.notna(), state)
+
+
+def county_labels(df_county):
+    confirmed = df_county["Confirmed"].fillna(0).astype(np.int64).map("{:,}".format)
+    deaths = df_county["Deaths"].fillna(0).astype(np.int64).map("{:,}".format)
+    return county_names(df_county) + ": " + confirmed + " Confirmed, " + deaths + " Deaths"
+
+
+def valid_points(df_county):
+    # JHU 里 "Unassigned" / "Out of ..." 等记录的坐标是空值或 (0, 0)
+    has_location = df_county["Lat"].notna() & df_county["Long_"].notna()
+    has_location &= (df_county["Lat"] != 0) | (df_county["Long_"] != 0)
+    return df_county[has_location]
+
+
+def county_map_figure(df_county, title=None):
+    df_points = valid_points(df_county)
+    confirmed = df_points["Confirmed"].fillna(0).to_numpy(dtype=np.float64)
+
+    fig = go.Figure(go.Scattermap(
+        lat=df_points["Lat"].to_numpy(dtype=np.float32),
+        lon=df_points["Long_"].to_numpy(dtype=np.float32),
+        mode="markers",
+        marker=dict(
+            size=np.clip(np.sqrt(confirmed) / 40, 3, 30).astype(np.float32),
+            color=np.log10(confirmed + 1).astype(np.float32),
+            colorscale="Reds",
+            cmin=0,
+            opacity=0.7,
+            colorbar=dict(title="Confirmed", tickvals=[1, 2, 3, 4, 5, 6], ticktext=["10", "100", "1k", "10k", "100k", "1M"])
+        ),
+        text=county_labels(df_points).to_numpy(),
+        hoverinfo="text"
+    ))
+    fig.update_layout(
+        title=title,
+        map=dict(style="carto-positron", center=dict(lat=37.8, lon=-96), zoom=3),
+        margin=dict(l=0, r=0, t=40 if title else 0, b=0),
+        height=600
+    )
+    return fig
+
+
+def empty_map_figure(message=NO_DATA_MESSAGE):
+    # 没有县级数据时显示的空地图和提示
+    fig = go.Figure(go.Scattermap())
+    fig.update_layout(
+        map=dict(style="carto-positron", center=dict(lat=37.8, lon=-96), zoom=3),
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=600,
+        annotations=[dict(text=message, showarrow=False, xref="paper", yref="paper", x=0.5, y=0.5,
+                          font=dict(size=16), bgcolor="rgba(255, 255, 255, 0.8)")]
+    )
+    return fig
+
+
+def register_us_map_route(server, build):
+    # build() 返回最新一天的县级地图，数据文件不存在时抛出 FileNotFoundError；
+    # 第一次请求时生成并缓存 JSON，缺数据时返回提示（不缓存，补上数据后下次请求即可生成）
+    lock = threading.Lock()
+    cache = {}
+
+    @server.route(US_MAP_URL)
+    def serve_us_map():
+        with lock:
+            if "body" not in cache:
+                try:
+                    cache["body"] = pio.to_json(build(), validate=False)
+                except FileNotFoundError as e:
+                    print(f"US county data not available: {e}")
+                    return Response(pio.to_json(empty_map_figure(), validate=False), mimetype="application/json")
+            return Response(cache["body"], mimetype="application/json")
+
+
+def save_county_map_json(fig, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(pio.to_json(fig, validate=False))
+    return path